@@ -89,6 +89,10 @@ class DisplayManager:
         # Emergency states that should keep display on
         self.emergency_states = ['off_grid', 'generator']
         
+        # Clock line is reformatted only when the wall-clock second changes
+        self._last_clock_sec = -1
+        self._last_clock_str = ""
+        
         # Button handler for manual display control
         self.button_handler = None
         self._setup_button()
@@ -247,7 +251,11 @@ class DisplayManager:
             display_indicator = state_to_indicator.get(current_state, '?')
 
         # Show time and frequency with power source indicator, updated once per second
-        current_time = time.strftime("%H:%M:%S")
+        now_sec = int(time.time())
+        if now_sec != self._last_clock_sec:
+            self._last_clock_str = time.strftime("%H:%M:%S", time.localtime(now_sec))
+            self._last_clock_sec = now_sec
+        current_time = self._last_clock_str
         
         line1 = f"{current_time}"
         if freq is not None:
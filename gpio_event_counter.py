@@ -13,11 +13,17 @@ import threading
 import datetime
 from typing import Optional, Dict, Tuple
 
+import numpy as np
+
 import gpiod  # libgpiod v2 Python bindings
 
 # Module-specific log level override (empty string or None to use default from config.yaml)
 MODULE_LOG_LEVEL = None  # Use default log level from config.yaml
 
+# Only the event thread gets real-time priority; it is pinned to the first of these cores that works
+# (core 3 is the last core on a Pi 4, away from most system activity)
+EVENT_THREAD_CORES = (3, 2)
+
 
 class GPIOEventCounter:
 	"""Pure-Python counter backend using libgpiod v2 edge events."""
@@ -185,8 +191,35 @@ class GPIOEventCounter:
 		self.logger.info(f"[PIN_REGISTER] Pin {pin} registered successfully in {register_duration:.1f}ms")
 		return True
 
+	def _raise_thread_priority(self):
+		"""Give the calling (event) thread SCHED_FIFO priority and pin it to a dedicated core.
+
+		Only this thread is raised, so Modbus, HTTP and logging threads stay at normal priority.
+		"""
+		tid = threading.get_native_id()
+		try:
+			priority = os.sched_get_priority_min(os.SCHED_FIFO) + 1
+			os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(priority))
+			self.logger.info(f"[THREAD_PRIORITY] Event thread {tid} set to SCHED_FIFO priority {priority}")
+		except (AttributeError, OSError) as e:
+			# No real-time permission; nice is per-thread on Linux, so this still only affects this thread
+			try:
+				os.nice(-5)
+				self.logger.info(f"[THREAD_PRIORITY] SCHED_FIFO unavailable ({e}), event thread nice set to -5")
+			except OSError as e:
+				self.logger.warning(f"[THREAD_PRIORITY] Could not raise event thread priority: {e}")
+
+		for core in EVENT_THREAD_CORES:
+			try:
+				os.sched_setaffinity(tid, {core})
+				self.logger.info(f"[THREAD_PRIORITY] Event thread pinned to core {core}")
+				return
+			except (AttributeError, OSError, ValueError) as e:
+				self.logger.warning(f"[THREAD_PRIORITY] Could not pin event thread to core {core}: {e}")
+
 	def _event_loop(self):
 		assert self._request is not None
+		self._raise_thread_priority()
 		loop_start_time = time.perf_counter()
 		self.logger.info(f"[EVENT_LOOP] Started at {loop_start_time:.3f}, thread={threading.current_thread().name}")
 		event_count = 0
@@ -207,7 +240,7 @@ class GPIOEventCounter:
 					timeout_count += 1
 					# Log only first few timeouts, then every 100th to reduce CPU overhead
 					if timeout_count <= 3 or timeout_count % 100 == 0:
-						self.logger.debug(f"[EVENT_WAIT] timeout after {wait_duration:.1f}ms (timeout #{timeout_count}, total waits={wait_count})")
+						self.logger.debug("[EVENT_WAIT] timeout after %.1fms (timeout #%d, total waits=%d)", wait_duration, timeout_count, wait_count)
 					continue
 
 				# Events are ready - read them
@@ -221,15 +254,25 @@ class GPIOEventCounter:
 
 				# Only log event reads occasionally to reduce CPU overhead (every 1000 events or if read takes >10ms)
 				if event_count % 1000 == 0 or read_duration > 10.0:
-					self.logger.debug(f"[EVENT_READ] got {len(events)} events, wait={wait_duration:.1f}ms, read={read_duration:.2f}ms")
+					self.logger.debug("[EVENT_READ] got %d events, wait=%.1fms, read=%.2fms", len(events), wait_duration, read_duration)
 				
 				with self._counts_lock:
+					# Bind per-batch locals so the per-event body avoids repeated attribute lookups
+					debounce_ns = self.debounce_ns
+					collect_intervals = self.logger.isEnabledFor(logging.DEBUG)
+					counts = self.counts
+					timestamps = self.timestamps
+					last_valid_timestamp = self.last_valid_timestamp
+					interval_stats = self._interval_stats
+					events_received = self._events_received
+					events_debounced = self._events_debounced
+					events_accepted = self._events_accepted
 					for ev in events:
 						pin = ev.line_offset
 						current_ts = ev.timestamp_ns
 						
 						# Track total events received from hardware
-						self._events_received[pin] = self._events_received.get(pin, 0) + 1
+						events_received[pin] = events_received.get(pin, 0) + 1
 						
 						# Calculate interval since last event (for gap detection)
 						if last_event_time_ns > 0:
@@ -239,51 +282,51 @@ class GPIOEventCounter:
 						
 						# Software filtering / Debounce
 						# Reject if interval < debounce_ns (e.g. 0.2ms)
-						last_ts = self.last_valid_timestamp.get(pin, 0)
-						if last_ts > 0 and (current_ts - last_ts) < self.debounce_ns:
+						last_ts = last_valid_timestamp.get(pin, 0)
+						if last_ts > 0 and (current_ts - last_ts) < debounce_ns:
 							# Noise detected, skip this event
-							interval_us = (current_ts - last_ts) / 1000
-							self._events_debounced[pin] = self._events_debounced.get(pin, 0) + 1
+							events_debounced[pin] = events_debounced.get(pin, 0) + 1
 							if event_count < 20:  # Log first debounced events
-								self.logger.debug(f"[EVENT_DEBOUNCE] Rejected event on pin {pin}, interval={interval_us:.1f}us < {self.debounce_ns/1000:.1f}us")
+								self.logger.debug("[EVENT_DEBOUNCE] Rejected event on pin %d, interval=%.1fus < %.1fus",
+												  pin, (current_ts - last_ts) / 1000, debounce_ns / 1000)
 							continue
 						
 						# Valid event - update last event time for gap detection
 						last_event_time_ns = current_ts
 						
-					# Track accepted events
-					self._events_accepted[pin] = self._events_accepted.get(pin, 0) + 1
-					
-					# Calculate and store interval for statistics (only if DEBUG logging enabled)
-					if last_ts > 0 and self.logger.isEnabledFor(logging.DEBUG):
-						interval_ns = current_ts - last_ts
-						self._interval_stats[pin].append(interval_ns)
-					
-					# Valid event
-					self.counts[pin] = self.counts.get(pin, 0) + 1
-					self.last_valid_timestamp[pin] = current_ts
-					
-					# Store timestamp (ns)
-					if pin in self.timestamps:
-						self.timestamps[pin].append(current_ts)
-						# Only log first event timestamp to reduce CPU overhead
-						if event_count == 1:
-							self.logger.debug(f"[EVENT] Stored first timestamp for pin {pin}: {current_ts}")
-						event_count += 1
-					else:
-						self.logger.warning(f"[EVENT] Pin {pin} not in timestamps dict! Keys: {list(self.timestamps.keys())}")
-						# Initialize the pin in timestamps dict if it's missing
-						with self._counts_lock:
-							self.timestamps.setdefault(pin, []).append(current_ts)
+						# Track accepted events
+						events_accepted[pin] = events_accepted.get(pin, 0) + 1
+						
+						# Calculate and store interval for statistics (only if DEBUG logging enabled)
+						if last_ts > 0 and collect_intervals:
+							interval_stats.setdefault(pin, []).append(current_ts - last_ts)
+						
+						# Valid event
+						counts[pin] = counts.get(pin, 0) + 1
+						last_valid_timestamp[pin] = current_ts
+						
+						# Store timestamp (ns)
+						pin_timestamps = timestamps.get(pin)
+						if pin_timestamps is not None:
+							pin_timestamps.append(current_ts)
+							# Only log first event timestamp to reduce CPU overhead
+							if event_count == 1:
+								self.logger.debug("[EVENT] Stored first timestamp for pin %d: %d", pin, current_ts)
+							event_count += 1
+							continue
+						
+						self.logger.warning(f"[EVENT] Pin {pin} not in timestamps dict! Keys: {list(timestamps.keys())}")
+						# Initialize the pin in timestamps dict if it's missing (the lock is already held)
+						timestamps[pin] = [current_ts]
 						event_count += 1
 						
 						# Log first 10 events with timing details
 						if event_count <= 10:
 							if last_ts > 0:
 								interval_ms = (current_ts - last_ts) / 1e6
-								self.logger.info(f"[EVENT] #{event_count} pin={pin} count={self.counts[pin]} interval={interval_ms:.2f}ms")
+								self.logger.info(f"[EVENT] #{event_count} pin={pin} count={counts[pin]} interval={interval_ms:.2f}ms")
 							else:
-								self.logger.info(f"[EVENT] #{event_count} pin={pin} count={self.counts[pin]} (first event)")
+								self.logger.info(f"[EVENT] #{event_count} pin={pin} count={counts[pin]} (first event)")
 				
 				# Log event rate periodically (every 1 second or 500 events)
 				now = time.perf_counter()
@@ -307,16 +350,32 @@ class GPIOEventCounter:
 	def get_count(self, pin: int) -> int:
 		with self._counts_lock:
 			count = int(self.counts.get(pin, 0))
-			self.logger.debug(f"[GET_COUNT] pin={pin} count={count} thread={threading.current_thread().name}")
+			if self.logger.isEnabledFor(logging.DEBUG):
+				self.logger.debug("[GET_COUNT] pin=%d count=%d thread=%s", pin, count, threading.current_thread().name)
 			return count
 
 	def get_timestamps(self, pin: int) -> list:
 		"""Get list of timestamps (ns) for the pin."""
 		with self._counts_lock:
 			timestamps = list(self.timestamps.get(pin, []))
-			self.logger.debug(f"[GET_TIMESTAMPS] pin={pin} count={len(timestamps)} thread={threading.current_thread().name}")
+			if self.logger.isEnabledFor(logging.DEBUG):
+				self.logger.debug("[GET_TIMESTAMPS] pin=%d count=%d thread=%s", pin, len(timestamps), threading.current_thread().name)
 			return timestamps
 	
+	def get_timestamps_array(self, pin: int, out: Optional[np.ndarray] = None) -> Tuple[int, np.ndarray]:
+		"""
+		Copy the pin's timestamps (ns) straight into an int64 array, without an intermediate list.
+		Fills 'out' when it is large enough, otherwise allocates a new array.
+		Returns: (count, array) - the timestamps are array[:count]
+		"""
+		with self._counts_lock:
+			ts_list = self.timestamps.get(pin, [])
+			count = len(ts_list)
+			if out is None or out.size < count:
+				out = np.empty(count, dtype=np.int64)
+			out[:count] = ts_list
+			return (count, out)
+	
 	def get_frequency_info(self, pin: int) -> Tuple[int, int, int]:
 		"""
 		Get frequency statistics without copying the full timestamp list.
@@ -328,13 +387,31 @@ class GPIOEventCounter:
 			if count > 0:
 				first_ts = ts_list[0]
 				last_ts = ts_list[-1]
-				duration_ms = (last_ts - first_ts) / 1e6
-				self.logger.debug(f"[GET_FREQ_INFO] pin={pin} count={count} duration={duration_ms:.1f}ms")
+				self.logger.debug("[GET_FREQ_INFO] pin=%d count=%d duration=%.1fms", pin, count, (last_ts - first_ts) / 1e6)
 				return (count, first_ts, last_ts)
 			else:
-				self.logger.debug(f"[GET_FREQ_INFO] pin={pin} count=0 (no timestamps)")
+				self.logger.debug("[GET_FREQ_INFO] pin=%d count=0 (no timestamps)", pin)
 				return (0, 0, 0)
 
+	def snapshot(self, pin: int, include_intervals: bool = False) -> Tuple[int, int, int, int, Optional[Dict[str, any]]]:
+		"""
+		Read the count, frequency info and event statistics under one lock acquisition,
+		so they all describe the same instant (the count always matches the timestamp count).
+		Returns: (count, timestamp_count, first_timestamp_ns, last_timestamp_ns, event_stats)
+		"""
+		with self._counts_lock:
+			count = int(self.counts.get(pin, 0))
+			ts_list = self.timestamps.get(pin, [])
+			stat_count = len(ts_list)
+			if stat_count > 0:
+				first_ts, last_ts = ts_list[0], ts_list[-1]
+			else:
+				first_ts = last_ts = 0
+			event_stats = self._event_statistics_locked(pin, include_intervals)
+		if self.logger.isEnabledFor(logging.DEBUG):
+			self.logger.debug("[SNAPSHOT] pin=%d count=%d timestamp_count=%d", pin, count, stat_count)
+		return (count, stat_count, first_ts, last_ts, event_stats)
+
 	def reset_count(self, pin: int) -> bool:
 		# Track lock acquisition time
 		lock_start = time.perf_counter()
@@ -397,7 +474,7 @@ class GPIOEventCounter:
 		try:
 			ready = self._request.wait_edge_events(timeout=timeout)
 			if not ready:
-				self.logger.debug(f"[POLL] No events ready (timeout={timeout}s)")
+				self.logger.debug("[POLL] No events ready (timeout=%ss)", timeout)
 				return 0
 
 			events = self._request.read_edge_events()
@@ -444,58 +521,56 @@ class GPIOEventCounter:
 			Dictionary with statistics or None if pin not found
 		"""
 		with self._counts_lock:
-			if pin not in self.counts:
-				return None
-			
-			received = self._events_received.get(pin, 0)
-			debounced = self._events_debounced.get(pin, 0)
-			accepted = self._events_accepted.get(pin, 0)
-			
-			stats = {
-				'received': received,
-				'debounced': debounced,
-				'accepted': accepted,
-				'count': self.counts.get(pin, 0),
-				'timestamp_count': len(self.timestamps.get(pin, [])),
-			}
-			
-			# Only calculate expensive interval statistics if explicitly requested
-			# This avoids O(n log n) sorting and multiple list passes on every measurement
-			if include_intervals:
-				intervals_ns = self._interval_stats.get(pin, [])
-				if len(intervals_ns) > 0:
-					intervals_us = [i / 1000.0 for i in intervals_ns]
-					intervals_ms = [i / 1000000.0 for i in intervals_ns]
-					stats['intervals'] = {
-						'count': len(intervals_ns),
-						'min_us': min(intervals_us),
-						'max_us': max(intervals_us),
-						'mean_us': sum(intervals_us) / len(intervals_us),
-						'min_ms': min(intervals_ms),
-						'max_ms': max(intervals_ms),
-						'mean_ms': sum(intervals_ms) / len(intervals_ms),
-					}
-					
-					# Calculate std dev
-					mean_us = stats['intervals']['mean_us']
-					variance = sum((x - mean_us) ** 2 for x in intervals_us) / len(intervals_us)
-					stats['intervals']['std_dev_us'] = variance ** 0.5
-					stats['intervals']['std_dev_ms'] = stats['intervals']['std_dev_us'] / 1000.0
-					
-					# Calculate median (expensive - requires sorting)
-					sorted_intervals_us = sorted(intervals_us)
-					mid = len(sorted_intervals_us) // 2
-					if len(sorted_intervals_us) % 2 == 0:
-						stats['intervals']['median_us'] = (sorted_intervals_us[mid - 1] + sorted_intervals_us[mid]) / 2.0
-					else:
-						stats['intervals']['median_us'] = sorted_intervals_us[mid]
-					stats['intervals']['median_ms'] = stats['intervals']['median_us'] / 1000.0
-				else:
-					stats['intervals'] = None
+			return self._event_statistics_locked(pin, include_intervals)
+	
+	def _event_statistics_locked(self, pin: int, include_intervals: bool) -> Dict[str, any]:
+		"""get_event_statistics body; the caller must hold _counts_lock."""
+		if pin not in self.counts:
+			return None
+		
+		received = self._events_received.get(pin, 0)
+		debounced = self._events_debounced.get(pin, 0)
+		accepted = self._events_accepted.get(pin, 0)
+		
+		stats = {
+			'received': received,
+			'debounced': debounced,
+			'accepted': accepted,
+			'count': self.counts.get(pin, 0),
+			'timestamp_count': len(self.timestamps.get(pin, [])),
+		}
+		
+		# Only calculate expensive interval statistics if explicitly requested
+		# This avoids O(n log n) sorting and multiple list passes on every measurement
+		if include_intervals:
+			intervals_ns = self._interval_stats.get(pin, [])
+			if len(intervals_ns) > 0:
+				# One float array for all the reductions instead of list passes per statistic
+				intervals_us = np.asarray(intervals_ns, dtype=np.float64) / 1000.0
+				min_us = float(intervals_us.min())
+				max_us = float(intervals_us.max())
+				mean_us = float(intervals_us.mean())
+				std_dev_us = float(intervals_us.std())
+				median_us = float(np.median(intervals_us))  # Partition-based, no full sort
+				stats['intervals'] = {
+					'count': len(intervals_ns),
+					'min_us': min_us,
+					'max_us': max_us,
+					'mean_us': mean_us,
+					'min_ms': min_us / 1000.0,
+					'max_ms': max_us / 1000.0,
+					'mean_ms': mean_us / 1000.0,
+					'std_dev_us': std_dev_us,
+					'std_dev_ms': std_dev_us / 1000.0,
+					'median_us': median_us,
+					'median_ms': median_us / 1000.0,
+				}
 			else:
 				stats['intervals'] = None
-			
-			return stats
+		else:
+			stats['intervals'] = None
+		
+		return stats
 	
 	def cleanup(self):
 		try:
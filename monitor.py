@@ -9,13 +9,12 @@ import argparse
 import csv
 import json
 import logging
+import math
 import os
-import random
 import signal
 import sys
 import time
 import socket
-from collections import deque
 from typing import Optional, Tuple, List, Dict, Any
 from enum import Enum
 
@@ -33,6 +32,7 @@ from offline_analyzer import OfflineAnalyzer
 from restart_manager import RestartManager
 from solark_integration import SolArkIntegration
 from health_check_reporter import HealthCheckReporter
+from ring_buffer import NDRingBuffer
 
 # Simulator imports (only used in simulator mode)
 _simulator_imports_available = False
@@ -50,6 +50,67 @@ USE_PULSE_INJECTION_IN_SIMULATOR = True
 # Module-specific log level override (empty string or None to use default from config.yaml)
 MODULE_LOG_LEVEL = None  # Use default log level from config.yaml
 
+# Power source classifications returned by FrequencyAnalyzer.classify_power_source
+SOURCE_UTILITY = "Utility Grid"
+SOURCE_GENERATOR = "Generac Generator"
+SOURCE_UNKNOWN = "Unknown"
+
+# Short display indicator for each classification (anything else shows "?")
+SOURCE_INDICATORS = {SOURCE_UTILITY: "Util", SOURCE_GENERATOR: "Gen"}
+
+# Main loop scheduling uses integer nanoseconds from time.monotonic_ns()
+NS_PER_SECOND = 1_000_000_000
+HOURLY_LOG_INTERVAL_NS = 3600 * NS_PER_SECOND
+
+# Allan deviation backend: False = direct single-tau NumPy calculation, True = full allantools.adev
+# (kept for cross-checking; both give identical results)
+USE_ALLANTOOLS_ADEV = False
+
+
+def _adev_octave_m(n_samples: int, rate: float, tau_target: float) -> Optional[int]:
+    """Averaging factor m (tau = m / rate) that allantools.adev would report closest to tau_target.
+
+    Depends only on the sample count, rate and tau, so callers can cache it per window length.
+    """
+    n_phase = n_samples + 1
+    tau0 = 1.0 / rate
+
+    # Octave averaging factors (1, 2, 4, ...) that leave at least 2 non-overlapping differences
+    best_m = None
+    m = 1
+    while m < n_phase:
+        if len(range(2 * m, n_phase, m)) > 1:
+            if best_m is None or abs(m * tau0 - tau_target) < abs(best_m * tau0 - tau_target):
+                best_m = m
+        m *= 2
+    return best_m
+
+
+def _adev_at_tau(frac_freq: np.ndarray, rate: float, tau_target: float, m: Optional[int] = None) -> Optional[float]:
+    """Allan deviation of fractional frequency data at the octave tau closest to tau_target.
+
+    Same result as taking the nearest tau from allantools.adev(frac_freq, rate, data_type='freq'),
+    but only the one tau that is actually used gets computed. Pass m (from _adev_octave_m)
+    to skip the tau search.
+    """
+    n_phase = len(frac_freq) + 1
+    tau0 = 1.0 / rate
+    best_m = _adev_octave_m(len(frac_freq), rate, tau_target) if m is None else m
+    if best_m is None:
+        return None
+
+    # Integrate (mean-removed) frequency to phase, starting at zero
+    phase = np.empty(n_phase)
+    phase[0] = 0.0
+    np.cumsum(frac_freq - frac_freq.mean(), out=phase[1:])
+    phase[1:] *= tau0
+
+    # Non-overlapping second differences at stride m
+    d0 = phase[::best_m]
+    n = len(d0) - 2
+    v = d0[2:] - 2.0 * d0[1:n + 1] + d0[:n]
+    return float(np.sqrt(np.dot(v, v) / (2.0 * n)) / (best_m * tau0))
+
 
 class PowerState(Enum):
     """Power system states."""
@@ -199,9 +260,9 @@ class PowerStateMachine:
             return PowerState.TRANSITIONING
 
         # Use existing frequency analysis classification
-        if power_source == "Utility Grid":
+        if power_source == SOURCE_UTILITY:
             return PowerState.GRID
-        elif power_source == "Generac Generator":
+        elif power_source == SOURCE_GENERATOR:
             return PowerState.GENERATOR
         else:  # "Unknown" or any other classification
             # If we have a pending transition and buffers were cleared, don't reset to TRANSITIONING
@@ -443,21 +504,66 @@ class FrequencyAnalyzer:
         self.logger = logger
         try:
             self.thresholds = config['analysis']['generator_thresholds']
+            avar_thresh = self.thresholds['allan_variance']
+            std_thresh = self.thresholds['std_dev']
         except KeyError as e:
-            raise KeyError(f"Missing required analysis configuration key: {e}")
+            raise KeyError(f"Missing required threshold configuration key: {e}")
+        # Validate once here so classify_power_source is plain float comparisons
+        try:
+            self.avar_thresh = float(avar_thresh)
+            self.std_thresh = float(std_thresh)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid threshold values: avar={avar_thresh}, std={std_thresh}. Error: {e}")
+
+        # Cache config values used on every measurement/analysis (config is fixed at startup)
+        try:
+            self.min_freq = config['sampling']['min_freq']
+            self.max_freq = config['sampling']['max_freq']
+            self.tau_target = config['analysis']['allan_variance_tau']
+        except KeyError as e:
+            raise KeyError(f"Missing required configuration key: {e}")
+        self.sample_rate = 1.0 / config.get_float('hardware.optocoupler.primary.measurement_duration')
 
         # Simulator state
         self.simulator_start_time = None
         self.simulator_state = "grid"  # grid -> off_grid -> generator -> grid
+        
+        # Simulator noise is drawn from pre-generated batches instead of one random.gauss() per sample
+        self._sim_rng = np.random.default_rng()
+        self._sim_batch_size = 4096
+        self._sim_normals = None
+        self._sim_uniforms = None
+        self._sim_idx = self._sim_batch_size
+        
+        # Allan deviation averaging factor per window length (only changes while the buffer fills)
+        self._adev_m_cache = {}
+        
+        # Measurement source; simulated until a hardware manager is attached
+        self.hardware_manager = None
+    
+    @property
+    def hardware_manager(self):
+        return self._hardware_manager
+    
+    @hardware_manager.setter
+    def hardware_manager(self, hardware_manager):
+        """Attach hardware and pick the measurement routine once, instead of on every call."""
+        self._hardware_manager = hardware_manager
+        if hardware_manager is None:
+            self._measure = self._measure_simulated
+        else:
+            self._measure = self._measure_hardware
     
     def count_zero_crossings(self, duration: float = 0.5) -> Optional[float]:
         """Count zero-crossings over duration. Returns frequency (Hz)."""
-        if not hasattr(self, 'hardware_manager'):
-            return self._simulate_frequency()
-        
+        return self._measure(duration)
+    
+    def _measure_simulated(self, duration: float) -> Optional[float]:
+        return self._simulate_frequency()
+    
+    def _measure_hardware(self, duration: float) -> Optional[float]:
         # Use optocoupler with libgpiod (required - no fallback)
-        if (hasattr(self.hardware_manager, 'optocoupler_initialized') and 
-            self.hardware_manager.optocoupler_initialized):
+        if getattr(self._hardware_manager, 'optocoupler_initialized', False):
             return self._count_optocoupler_frequency(duration)
         
         # Optocoupler not initialized - this should not happen if libgpiod is working
@@ -469,12 +575,8 @@ class FrequencyAnalyzer:
         if freq is None:
             return False
         
-        # Check 1: Frequency range validation
-        try:
-            min_freq = self.config['sampling']['min_freq']
-            max_freq = self.config['sampling']['max_freq']
-        except KeyError as e:
-            raise KeyError(f"Missing required sampling configuration key: {e}")
+        # Check 1: Frequency range validation (also rejects NaN/inf)
+        min_freq, max_freq = self.min_freq, self.max_freq
         if not (min_freq <= freq <= max_freq):
             self.logger.warning(f"Frequency {freq:.2f}Hz outside valid range {min_freq}-{max_freq}Hz")
             return False
@@ -489,7 +591,7 @@ class FrequencyAnalyzer:
         
         # Check 3: Signal stability (if we have recent history)
         if hasattr(self, 'freq_buffer') and len(self.freq_buffer) >= 3:
-            recent_freqs = list(self.freq_buffer)[-3:]
+            recent_freqs = self.freq_buffer.as_ndarray_view()[-3:]
             freq_std = np.std(recent_freqs)
             if freq_std > 2.0:  # >2Hz standard deviation indicates noise
                 self.logger.warning(f"High frequency variation detected: {freq_std:.2f}Hz std dev")
@@ -505,7 +607,7 @@ class FrequencyAnalyzer:
         
         # Additional checks for sudden jumps
         if freq and hasattr(self, 'freq_buffer') and len(self.freq_buffer) >= 5:
-            recent_freqs = list(self.freq_buffer)[-5:]
+            recent_freqs = self.freq_buffer.as_ndarray_view()[-5:]
             if abs(freq - np.mean(recent_freqs)) > 5.0:  # >5Hz jump
                 self.logger.warning(f"Sudden frequency jump detected: {freq:.2f}Hz")
                 return None
@@ -536,14 +638,9 @@ class FrequencyAnalyzer:
                 self.logger.warning(f"Failed to calculate frequency from {pulse_count} pulses")
                 return None
             
-            # Validate frequency range
-            try:
-                min_freq = self.config['sampling']['min_freq']
-                max_freq = self.config['sampling']['max_freq']
-            except KeyError as e:
-                raise KeyError(f"Missing required sampling configuration key: {e}")
-            
-            if frequency < min_freq or frequency > max_freq:
+            # Validate frequency range (chained comparison also rejects NaN)
+            min_freq, max_freq = self.min_freq, self.max_freq
+            if not (min_freq <= frequency <= max_freq):
                 self.logger.warning(f"Invalid frequency reading: {frequency:.2f} Hz (outside range {min_freq}-{max_freq} Hz)")
                 return None
             
@@ -559,6 +656,16 @@ class FrequencyAnalyzer:
             self.logger.error(f"Error in optocoupler frequency measurement: {e}")
             return None
     
+    def _next_sim_noise(self) -> Tuple[float, float]:
+        """Return (standard normal, uniform [0, 1)) draws from the simulator's batch, refilling when empty."""
+        if self._sim_idx >= self._sim_batch_size:
+            self._sim_normals = self._sim_rng.standard_normal(self._sim_batch_size).tolist()
+            self._sim_uniforms = self._sim_rng.random(self._sim_batch_size).tolist()
+            self._sim_idx = 0
+        idx = self._sim_idx
+        self._sim_idx = idx + 1
+        return self._sim_normals[idx], self._sim_uniforms[idx]
+    
     def _simulate_frequency(self) -> Optional[float]:
         """Simulate power state cycling: grid (20s) -> off-grid (10s) -> generator (20s) -> grid (40s).
         
@@ -579,6 +686,7 @@ class FrequencyAnalyzer:
         expected_state = None
         expected_freq_desc = None
         actual_freq = None
+        gauss, uniform = self._next_sim_noise()
 
         if cycle_time < 20.0:
             # Grid power (0-20s): very stable 60 Hz
@@ -586,7 +694,7 @@ class FrequencyAnalyzer:
             expected_state = "grid"
             expected_freq_desc = "~60.0 Hz ± 0.005 (stable)"
             base_freq = 60.0
-            noise = random.gauss(0, 0.005)  # Very small stable noise
+            noise = 0.005 * gauss  # Very small stable noise
             actual_freq = float(base_freq + noise)
 
         elif cycle_time < 30.0:
@@ -603,12 +711,12 @@ class FrequencyAnalyzer:
             # Simulate generator hunting: alternating high/low
             phase_in_cycle = (cycle_time - 30.0) % 2.0
             if phase_in_cycle < 1.0:
-                base_freq = 58.5 + random.uniform(-0.5, 1.0)  # Low range: 58.0-59.5 Hz
+                base_freq = 58.5 + (-0.5 + 1.5 * uniform)  # Low range: 58.0-59.5 Hz
                 expected_freq_desc = "58.0-59.5 Hz (low phase, hunting pattern)"
             else:
-                base_freq = 61.0 + random.uniform(-1.0, 0.5)  # High range: 60.0-61.5 Hz
+                base_freq = 61.0 + (-1.0 + 1.5 * uniform)  # High range: 60.0-61.5 Hz
                 expected_freq_desc = "60.0-61.5 Hz (high phase, hunting pattern)"
-            noise = random.gauss(0, 0.3)  # Moderate generator noise
+            noise = 0.3 * gauss  # Moderate generator noise
             actual_freq = float(base_freq + noise)
 
         else:
@@ -617,7 +725,7 @@ class FrequencyAnalyzer:
             expected_state = "grid"
             expected_freq_desc = "~60.0 Hz ± 0.005 (stable)"
             base_freq = 60.0
-            noise = random.gauss(0, 0.005)  # Very small stable noise
+            noise = 0.005 * gauss  # Very small stable noise
             actual_freq = float(base_freq + noise)
 
         # Log expected vs actual for debugging
@@ -628,11 +736,13 @@ class FrequencyAnalyzer:
 
         return actual_freq
     
-    def analyze_stability(self, frac_freq: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+    def analyze_stability(self, frac_freq: np.ndarray, std_freq: Optional[float] = None) -> Tuple[Optional[float], Optional[float]]:
         """Compute Allan variance and standard deviation (simplified - kurtosis removed).
         
         Allan variance requires at least 6 samples for reliability. With fewer samples,
         only standard deviation is calculated (which works with any sample size).
+        If std_freq (Hz) is already known, e.g. from the ring buffer's running sums,
+        it is used as-is instead of being recomputed.
         """
         # Check for None input first
         if frac_freq is None:
@@ -645,34 +755,36 @@ class FrequencyAnalyzer:
             return None, None
         
         try:
-            # Validate input data type - must be numeric
-            if not isinstance(frac_freq, (np.ndarray, list, tuple)):
-                self.logger.error(f"Invalid data type for frac_freq: {type(frac_freq)}. Expected numpy array, list, or tuple.")
-                return None, None
-            
-            # Convert to numpy array and validate all elements are numeric
-            try:
-                frac_freq_array = np.array(frac_freq)
-            except (ValueError, TypeError) as e:
-                self.logger.error(f"Failed to convert frac_freq to numpy array: {e}. Data contains non-numeric values.")
-                return None, None
-            
-            # Check if all elements are numeric (not strings, etc.)
-            if frac_freq_array.dtype.kind in ['U', 'S', 'O']:  # Unicode, byte string, or object
-                self.logger.error(f"frac_freq contains non-numeric data. Dtype: {frac_freq_array.dtype}")
-                return None, None
-            
-            if not np.issubdtype(frac_freq_array.dtype, np.number):
-                self.logger.error(f"frac_freq contains non-numeric data. Dtype: {frac_freq_array.dtype}")
-                return None, None
-            
-            # Check for NaN or infinite values
-            if np.any(np.isnan(frac_freq_array)) or np.any(np.isinf(frac_freq_array)):
-                self.logger.error("frac_freq contains NaN or infinite values")
-                return None, None
+            # Input validation: the monitor only feeds finite float arrays, so these
+            # checks are skipped when running optimized (python -O)
+            if __debug__:
+                # Validate input data type - must be numeric
+                if not isinstance(frac_freq, (np.ndarray, list, tuple)):
+                    self.logger.error(f"Invalid data type for frac_freq: {type(frac_freq)}. Expected numpy array, list, or tuple.")
+                    return None, None
+                
+                # Convert to numpy array and validate all elements are numeric
+                try:
+                    frac_freq_array = np.asarray(frac_freq)
+                except (ValueError, TypeError) as e:
+                    self.logger.error(f"Failed to convert frac_freq to numpy array: {e}. Data contains non-numeric values.")
+                    return None, None
+                
+                # Check if all elements are numeric (not strings, etc.)
+                if not np.issubdtype(frac_freq_array.dtype, np.number):
+                    self.logger.error(f"frac_freq contains non-numeric data. Dtype: {frac_freq_array.dtype}")
+                    return None, None
+                
+                # Check for NaN or infinite values
+                if not np.isfinite(frac_freq_array).all():
+                    self.logger.error("frac_freq contains NaN or infinite values")
+                    return None, None
+            else:
+                frac_freq_array = np.asarray(frac_freq)
             
             # Calculate standard deviation (works with any sample size >= 3)
-            std_freq = float(np.std(frac_freq_array * 60.0))
+            if std_freq is None:
+                std_freq = float(np.std(frac_freq_array * 60.0))
             
             # Allan variance requires at least 6 samples for reliability
             # Skip calculation if insufficient samples (saves computation and avoids unreliable values)
@@ -681,36 +793,34 @@ class FrequencyAnalyzer:
                 return None, std_freq  # Return None for Allan variance, but keep std_dev
             
             # Calculate Allan variance only when we have enough samples
-            try:
-                # Calculate sample rate from measurement_duration (samples per second)
-                measurement_duration = self.config.get_float('hardware.optocoupler.primary.measurement_duration')
-                sample_rate = 1.0 / measurement_duration
-                tau_target = self.config['analysis']['allan_variance_tau']
-            except KeyError as e:
-                raise KeyError(f"Missing required configuration key: {e}")
-            
-            # Use allantools.adev for Allan deviation calculation
-            taus_out, adev, _, _ = allantools.adev(frac_freq_array, rate=sample_rate, data_type='freq')
-            if taus_out.size > 0 and adev.size > 0:
-                avar_10s = float(adev[np.argmin(np.abs(taus_out - tau_target))])
+            if USE_ALLANTOOLS_ADEV:
+                taus_out, adev, _, _ = allantools.adev(frac_freq_array, rate=self.sample_rate, data_type='freq')
+                if taus_out.size > 0 and adev.size > 0:
+                    avar_10s = float(adev[np.argmin(np.abs(taus_out - self.tau_target))])
+                else:
+                    avar_10s = None
             else:
-                avar_10s = None
+                n_samples = len(frac_freq_array)
+                if n_samples not in self._adev_m_cache:
+                    self._adev_m_cache[n_samples] = _adev_octave_m(n_samples, self.sample_rate, self.tau_target)
+                avar_10s = _adev_at_tau(frac_freq_array.astype(np.float64, copy=False), self.sample_rate,
+                                        self.tau_target, self._adev_m_cache[n_samples])
             
             return avar_10s, std_freq
         except Exception as e:
             self.logger.error(f"Error in stability analysis: {e}")
             return None, None
     
-    def analyze_signal_quality(self, freq_data: List[float]) -> Tuple[Optional[float], Optional[float]]:
+    def analyze_signal_quality(self, freq_data: List[float], std_freq: Optional[float] = None) -> Tuple[Optional[float], Optional[float]]:
         """Simplified signal analysis - returns Allan variance and standard deviation only."""
         # In simulator mode, allow analysis with fewer samples for faster state transitions
         min_samples = 3 if hasattr(self, 'simulator_mode') and getattr(self, 'simulator_mode', False) else 10
         if len(freq_data) < min_samples:
             return None, None
         
-        freq_array = np.array(freq_data)
+        freq_array = np.asarray(freq_data, dtype=np.float64)
         frac_freq = (freq_array - 60.0) / 60.0
-        avar_10s, std_freq = self.analyze_stability(frac_freq)
+        avar_10s, std_freq = self.analyze_stability(frac_freq, std_freq)
         
         return avar_10s, std_freq
     
@@ -722,22 +832,10 @@ class FrequencyAnalyzer:
         - Then use simple OR logic (either metric beyond threshold => generator).
         """
         if std_freq is None:
-            return "Unknown"
+            return SOURCE_UNKNOWN
         
-        # Get thresholds and ensure they are numeric
-        try:
-            avar_thresh = self.thresholds['allan_variance']
-            std_thresh = self.thresholds['std_dev']
-        except KeyError as e:
-            raise KeyError(f"Missing required threshold configuration key: {e}")
-        
-        # Convert to float to ensure numeric comparison
-        try:
-            avar_thresh = float(avar_thresh)
-            std_thresh = float(std_thresh)
-        except (ValueError, TypeError) as e:
-            self.logger.error(f"Invalid threshold values: avar={avar_thresh}, std={std_thresh}. Error: {e}")
-            return "Unknown"
+        avar_thresh = self.avar_thresh
+        std_thresh = self.std_thresh
         
         # Normalize sample count
         sample_count = sample_count or 0
@@ -747,26 +845,26 @@ class FrequencyAnalyzer:
         
         # Not enough data yet
         if sample_count < min_samples_for_any:
-            return "Unknown"
+            return SOURCE_UNKNOWN
         
         # Until Allan variance has enough samples (or is missing), rely on std-dev only
         # This prevents false positives from Allan variance with insufficient data (e.g., startup transients)
         if sample_count < min_samples_for_avar or avar_10s is None:
-            return "Generac Generator" if std_freq > std_thresh else "Utility Grid"
+            return SOURCE_GENERATOR if std_freq > std_thresh else SOURCE_UTILITY
         
         # For 10-12 samples: Use AND logic (both metrics must exceed threshold) for extra protection
         # This prevents false positives from startup transients that might still be in the window
         if sample_count < min_samples_for_or_logic:
             if avar_10s > avar_thresh and std_freq > std_thresh:
-                return "Generac Generator"
-            return "Utility Grid"
+                return SOURCE_GENERATOR
+            return SOURCE_UTILITY
         
         # For 13+ samples: Use OR logic (either metric beyond threshold => generator)
         # With enough samples, Allan variance is fully reliable and startup transients are out of window
         # std_dev catches wide swings, Allan variance catches hunting patterns - either indicates generator
         if avar_10s > avar_thresh or std_freq > std_thresh:
-            return "Generac Generator"
-        return "Utility Grid"
+            return SOURCE_GENERATOR
+        return SOURCE_UTILITY
 
 
 class FrequencyMonitor:
@@ -975,8 +1073,23 @@ class FrequencyMonitor:
         # Ensure buffer can hold at least enough samples for analysis (minimum 10 for Allan variance)
         buffer_size = max(buffer_size, 10)
         
-        self.freq_buffer = deque(maxlen=buffer_size)
-        self.time_buffer = deque(maxlen=buffer_size)
+        # Cache timing values used on every loop iteration (config is fixed at startup)
+        self.measurement_duration = measurement_duration
+        self.samples_for_analysis = int(analysis_window_seconds / measurement_duration)
+        self.primary_name = self.config.get('hardware.optocoupler.primary.name')
+        display_interval = self.config.get_float('app.display_update_interval')
+        self.display_interval_ns = int(display_interval * NS_PER_SECOND)
+        self.loop_sleep_interval = self.config.get_float('app.loop_sleep_interval')
+        try:
+            self.memory_log_file = self.config['logging']['memory_log_file']
+        except KeyError as e:
+            raise KeyError(f"Missing required logging configuration key: {e}")
+        # Classification can't change faster than the display shows it or the Allan tau resolves it
+        self.analysis_interval_ns = int(max(display_interval, self.analyzer.tau_target / 10.0) * NS_PER_SECOND)
+        
+        # float32 holds 60 Hz readings to ~4 uHz, well below measurement noise; analysis upcasts to float64
+        self.freq_buffer = NDRingBuffer(buffer_size, dtype=np.float32)
+        self.time_buffer = NDRingBuffer(buffer_size)  # Contiguous float64 time axis
         
         # Clear buffers on startup to ensure fresh analysis
         self._clear_buffers()
@@ -986,11 +1099,13 @@ class FrequencyMonitor:
         """Initialize state variables."""
         # State variables
         self.running = True
-        self.last_log_time = 0
-        self.last_display_time = 0
         self.sample_count = 0
-        self.start_time = time.time()
-        self.zero_voltage_start_time = None  # Track when voltage went to zero (absolute time)
+        self.start_time = time.time()  # Wall clock, for log timestamps
+        # Loop timing uses the monotonic clock so NTP steps can't stall or double-fire periodic tasks
+        self.start_time_ns = time.monotonic_ns()
+        self.last_log_time_ns = self.start_time_ns - HOURLY_LOG_INTERVAL_NS  # Log status on the first pass
+        self.last_display_time_ns = self.start_time_ns - self.display_interval_ns
+        self.zero_voltage_start_ns = None  # Track when voltage went to zero (monotonic ns)
         self.zero_voltage_duration = 0.0    # How long voltage has been zero
         
         # Non-blocking measurement state
@@ -999,20 +1114,25 @@ class FrequencyMonitor:
         
         # Store current values for health check reporter callback
         self.last_freq = None
-        self.last_source = "Unknown"
+        self.last_source = SOURCE_UNKNOWN
+        
+        # Analysis cadence tracking (reuse the last classification between runs)
+        self.last_analysis_time_ns = self.start_time_ns - self.analysis_interval_ns
+        self.last_analysis_results = {}
 
         # Reset button state tracking
         self.reset_button_pressed = False
-        self.last_reset_check = 0
+        self.last_reset_check_ns = self.start_time_ns
         
         # Buffer validation tracking
         self.last_buffer_validation = 0
         self.buffer_validation_interval = 100  # Validate every 100 samples
         self.buffer_corruption_count = 0
         
-        # Memory monitoring tracking (run every 100 iterations = ~5 seconds with 50ms sleep)
-        self.loop_iteration_count = 0
-        self.memory_monitoring_interval = 100  # Run memory monitoring every 100 loop iterations (reduced frequency for CPU optimization)
+        # Memory monitoring runs on a timer (thresholds move on a minutes timescale, not per loop)
+        memory_check_interval = float(self.config.get('memory.check_interval', 30.0))
+        self.memory_check_interval_ns = int(memory_check_interval * NS_PER_SECOND)
+        self.last_memory_check_ns = self.start_time_ns - self.memory_check_interval_ns  # Check on the first pass
     
     def _start_background_services(self):
         """Start background services and health check reporter."""
@@ -1056,9 +1176,8 @@ class FrequencyMonitor:
                     
                     # Get current state from state machines
                     try:
-                        primary_name = self.config.get('hardware.optocoupler.primary.name')
-                        if primary_name in self.state_machines:
-                            state_info_dict = self.state_machines[primary_name].get_state_info()
+                        if self.primary_name in self.state_machines:
+                            state_info_dict = self.state_machines[self.primary_name].get_state_info()
                             state_info['current_state'] = state_info_dict.get('current_state', 'unknown')
                     except Exception as e:
                         self.logger.debug(f"Error getting state machine info for health check: {e}")
@@ -1113,26 +1232,21 @@ class FrequencyMonitor:
             power_source classification string
         """
         if freq is None:
-            return "Unknown"
+            return SOURCE_UNKNOWN
         
         # Use the same analysis logic as the main loop: configurable analysis window
-        measurement_duration = self.config.get_float('hardware.optocoupler.primary.measurement_duration')
-        try:
-            analysis_window_seconds = self.config.get_float('analysis.analysis_window_seconds')
-        except (KeyError, ValueError):
-            analysis_window_seconds = 20.0  # Default fallback
-        samples_for_analysis = int(analysis_window_seconds / measurement_duration)
+        samples_for_analysis = self.samples_for_analysis
         samples_needed = 3  # Minimum: 3 samples required for analysis
         
         if len(self.freq_buffer) >= samples_needed:
             # Use 30-second analysis window (most recent samples)
             samples_to_use = min(samples_for_analysis, len(self.freq_buffer))
-            recent_data = list(self.freq_buffer)[-samples_to_use:]
-            avar_10s, std_freq = self.analyzer.analyze_signal_quality(recent_data)
+            recent_data = self.freq_buffer.as_ndarray_view()[-samples_to_use:]
+            avar_10s, std_freq = self.analyzer.analyze_signal_quality(recent_data, self._running_std(samples_to_use))
             source = self.analyzer.classify_power_source(avar_10s, std_freq, len(recent_data))
         else:
             # Not enough data - stay in Unknown state
-            source = "Unknown"
+            source = SOURCE_UNKNOWN
         
         return source
     
@@ -1198,13 +1312,8 @@ class FrequencyMonitor:
                     
                     # Validate frequency range
                     if freq is not None:
-                        try:
-                            min_freq = self.config['sampling']['min_freq']
-                            max_freq = self.config['sampling']['max_freq']
-                        except KeyError as e:
-                            raise KeyError(f"Missing required sampling configuration key: {e}")
-                        
-                        if freq < min_freq or freq > max_freq:
+                        min_freq, max_freq = self.analyzer.min_freq, self.analyzer.max_freq
+                        if not (min_freq <= freq <= max_freq):  # Also rejects NaN
                             self.logger.warning(f"Invalid frequency reading: {freq:.2f} Hz (outside range {min_freq}-{max_freq} Hz)")
                             freq = None
                 
@@ -1251,15 +1360,15 @@ class FrequencyMonitor:
     def _update_zero_voltage_tracking(self, freq: Optional[float]):
         """Update zero voltage duration tracking."""
         try:
-            current_absolute_time = time.time()
+            now_ns = time.monotonic_ns()
             if freq is None or freq == 0:
                 # No frequency detected - voltage is zero
-                if self.zero_voltage_start_time is None:
-                    self.zero_voltage_start_time = current_absolute_time
-                self.zero_voltage_duration = current_absolute_time - self.zero_voltage_start_time
+                if self.zero_voltage_start_ns is None:
+                    self.zero_voltage_start_ns = now_ns
+                self.zero_voltage_duration = (now_ns - self.zero_voltage_start_ns) / NS_PER_SECOND
             else:
                 # Frequency detected - reset zero voltage tracking
-                self.zero_voltage_start_time = None
+                self.zero_voltage_start_ns = None
                 self.zero_voltage_duration = 0.0
         except Exception as e:
             self.logger.error(f"Error updating zero voltage tracking: {e}", exc_info=True)
@@ -1271,19 +1380,16 @@ class FrequencyMonitor:
                 self.logger.info(f"No frequency reading (zero voltage duration: {self.zero_voltage_duration:.1f}s)")
                 return None
             
-            if not isinstance(freq, (int, float)):
-                self.logger.error(f"Invalid frequency data type: {type(freq)}. Expected number, got {freq}")
-                return None
-            
-            if np.isnan(freq) or np.isinf(freq):
-                self.logger.error(f"Invalid frequency value: {freq}")
-                return None
-            
-            # Enhanced validation for accuracy
+            # Enhanced validation for accuracy. Its range check is a chained comparison,
+            # which is False for NaN and +/-inf, so no separate finiteness test is needed.
             pulse_count = getattr(self, 'last_pulse_count', 0)  # Get from optocoupler if available
             validated_freq = self.analyzer.validate_frequency_reading(freq, pulse_count, measurement_duration)
             if validated_freq is None:
-                self.logger.warning(f"Frequency reading failed validation: {freq:.2f}Hz")
+                # Only classify the failure here, off the hot path: NaN/inf is an error, not just a bad reading
+                if math.isfinite(freq):
+                    self.logger.warning(f"Frequency reading failed validation: {freq:.2f}Hz")
+                else:
+                    self.logger.error(f"Invalid frequency value: {freq}")
                 return None
             
             return validated_freq
@@ -1294,7 +1400,7 @@ class FrequencyMonitor:
     def _update_buffers(self, freq: float):
         """Update frequency and time buffers."""
         try:
-            elapsed_time = time.time() - self.start_time
+            elapsed_time = (time.monotonic_ns() - self.start_time_ns) / NS_PER_SECOND
             self.freq_buffer.append(freq)
             self.time_buffer.append(elapsed_time)
             self.sample_count += 1
@@ -1326,36 +1432,31 @@ class FrequencyMonitor:
         """
         try:
             if freq is None:
-                return "Unknown", {}
+                return SOURCE_UNKNOWN, {}
             
             # Get analysis window
-            try:
-                analysis_window_seconds = self.config.get_float('analysis.analysis_window_seconds')
-            except (KeyError, ValueError):
-                analysis_window_seconds = 20.0  # Default fallback
-            
-            measurement_duration = self.config.get_float('hardware.optocoupler.primary.measurement_duration')
-            samples_for_analysis = int(analysis_window_seconds / measurement_duration)
+            measurement_duration = self.measurement_duration
+            samples_for_analysis = self.samples_for_analysis
             samples_needed = 3  # Minimum: 3 samples required for analysis
             
             if len(self.freq_buffer) < samples_needed:
                 self.logger.debug(f"Not enough samples for analysis (have {len(self.freq_buffer)}, need {samples_needed} sample(s), each covering {measurement_duration}s)")
-                return "Unknown", {}
+                return SOURCE_UNKNOWN, {}
             
             # Use analysis window (most recent samples)
             samples_to_use = min(samples_for_analysis, len(self.freq_buffer))
             self.logger.debug(f"Analysis with {len(self.freq_buffer)} samples in buffer (using last {samples_to_use} samples = {samples_to_use * measurement_duration:.1f}s window)")
-            recent_data = list(self.freq_buffer)[-samples_to_use:]
+            recent_data = self.freq_buffer.as_ndarray_view()[-samples_to_use:]
             
             # Simplified signal analysis (std_dev + allan_variance only)
-            avar_10s, std_freq = self.analyzer.analyze_signal_quality(recent_data)
+            avar_10s, std_freq = self.analyzer.analyze_signal_quality(recent_data, self._running_std(samples_to_use))
             source = self.analyzer.classify_power_source(avar_10s, std_freq, len(recent_data))
             
             # Debug logging for classification
             self.logger.debug(f"Analysis results: avar={avar_10s}, std={std_freq}, source={source}")
             if len(recent_data) >= 2:
-                freq_range = max(recent_data) - min(recent_data)
-                self.logger.debug(f"Recent frequency range: {freq_range:.2f} Hz (min: {min(recent_data):.2f}, max: {max(recent_data):.2f})")
+                freq_min, freq_max = recent_data.min(), recent_data.max()
+                self.logger.debug(f"Recent frequency range: {freq_max - freq_min:.2f} Hz (min: {freq_min:.2f}, max: {freq_max:.2f})")
             
             return source, {
                 'allan_variance': avar_10s,
@@ -1363,7 +1464,13 @@ class FrequencyMonitor:
             }
         except Exception as e:
             self.logger.error(f"Error in analysis and classification: {e}", exc_info=True)
-            return "Unknown", {}
+            return SOURCE_UNKNOWN, {}
+    
+    def _running_std(self, samples_to_use: int) -> Optional[float]:
+        """Running std of the frequency buffer, if the analysis window covers the whole buffer."""
+        if samples_to_use == len(self.freq_buffer):
+            return self.freq_buffer.std()
+        return None
     
     def _update_state_machines(self, freq: Optional[float], source: str) -> Dict[str, PowerState]:
         """
@@ -1372,7 +1479,7 @@ class FrequencyMonitor:
         """
         try:
             current_states = {}
-            primary_name = self.config.get('hardware.optocoupler.primary.name')
+            primary_name = self.primary_name
             
             if primary_name in self.state_machines:
                 state_machine = self.state_machines[primary_name]
@@ -1392,8 +1499,7 @@ class FrequencyMonitor:
             # Use last known frequency if measurement in progress
             display_freq = self.last_freq if self.measurement_in_progress else freq
             ug_indicator = self._get_power_source_indicator(source)
-            primary_name = self.config.get('hardware.optocoupler.primary.name')
-            primary_state_machine = self.state_machines.get(primary_name)
+            primary_state_machine = self.state_machines.get(self.primary_name)
             
             if primary_state_machine:
                 self.hardware.display.update_display_and_leds(
@@ -1403,7 +1509,7 @@ class FrequencyMonitor:
         except Exception as e:
             self.logger.error(f"Error updating display: {e}", exc_info=True)
     
-    def _log_hourly_status(self, current_time: float, freq: Optional[float], source: str, analysis_results: Dict[str, Any]):
+    def _log_hourly_status(self, current_time_ns: int, freq: Optional[float], source: str, analysis_results: Dict[str, Any]):
         """Log hourly status and memory information."""
         try:
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -1417,11 +1523,7 @@ class FrequencyMonitor:
                                              state_info=all_state_info)
 
             # Log memory information to CSV
-            try:
-                memory_csv_file = self.config['logging']['memory_log_file']
-            except KeyError as e:
-                raise KeyError(f"Missing required logging configuration key: {e}")
-            self.memory_monitor.log_memory_to_csv(memory_csv_file)
+            self.memory_monitor.log_memory_to_csv(self.memory_log_file)
 
             # Log memory summary
             memory_summary = self.memory_monitor.get_memory_summary()
@@ -1448,7 +1550,7 @@ class FrequencyMonitor:
         except Exception as e:
             self.logger.error(f"Error logging and collecting data: {e}", exc_info=True)
     
-    def _handle_periodic_tasks(self, current_time: float, freq: Optional[float], source: str, analysis_results: Dict[str, Any]):
+    def _handle_periodic_tasks(self, current_time_ns: int, freq: Optional[float], source: str, analysis_results: Dict[str, Any]):
         """
         Handle periodic tasks: display updates, buffer validation, hourly logging.
         """
@@ -1459,15 +1561,14 @@ class FrequencyMonitor:
                 self.last_buffer_validation = self.sample_count
             
             # Display updates
-            display_interval = self.config.get_float('app.display_update_interval')
-            if current_time - self.last_display_time >= display_interval:
+            if current_time_ns - self.last_display_time_ns >= self.display_interval_ns:
                 self._update_display(freq, source)
-                self.last_display_time = current_time
+                self.last_display_time_ns = current_time_ns
             
             # Hourly logging
-            if current_time - self.last_log_time >= 3600:
-                self._log_hourly_status(current_time, freq, source, analysis_results)
-                self.last_log_time = current_time
+            if current_time_ns - self.last_log_time_ns >= HOURLY_LOG_INTERVAL_NS:
+                self._log_hourly_status(current_time_ns, freq, source, analysis_results)
+                self.last_log_time_ns = current_time_ns
         except Exception as e:
             self.logger.error(f"Error handling periodic tasks: {e}", exc_info=True)
     
@@ -1475,9 +1576,10 @@ class FrequencyMonitor:
         """Check if we should exit the main loop."""
         try:
             # Check for simulator auto-exit
-            if simulator_mode and hasattr(self, 'simulator_exit_time'):
-                if time.time() >= self.simulator_exit_time:
-                    elapsed = time.time() - self.start_time
+            if simulator_mode and hasattr(self, 'simulator_exit_time_ns'):
+                now_ns = time.monotonic_ns()
+                if now_ns >= self.simulator_exit_time_ns:
+                    elapsed = (now_ns - self.start_time_ns) / NS_PER_SECOND
                     self.logger.info(f"Simulator auto-exit time reached ({elapsed:.1f} seconds)")
                     return True
             return False
@@ -1488,11 +1590,10 @@ class FrequencyMonitor:
     def _loop_sleep(self):
         """Sleep to prevent busy-waiting in main loop."""
         try:
-            loop_sleep_interval = self.config.get_float('app.loop_sleep_interval')  # Default 50ms
             if self.measurement_in_progress:
                 # Sleep during measurement to avoid busy-waiting
                 # Still responsive enough for button checks and other tasks
-                time.sleep(loop_sleep_interval)
+                time.sleep(self.loop_sleep_interval)  # Default 50ms
             else:
                 # When measurement completes, still sleep a small amount to prevent tight looping
                 # Use a shorter sleep (10ms) for better responsiveness after measurement completes
@@ -1556,12 +1657,12 @@ class FrequencyMonitor:
 
         # For simulator mode, set up auto-exit after 90 seconds (one full cycle)
         if simulator_mode:
-            self.simulator_exit_time = time.time() + 90.0
+            self.simulator_exit_time_ns = time.monotonic_ns() + 90 * NS_PER_SECOND
             self.logger.info("Simulator mode: will auto-exit after 90 seconds (one full cycle: 20s grid -> 10s off-grid -> 20s generator -> 40s grid)")
         
         try:
-            # Get measurement duration once at start
-            measurement_duration = self.config.get_float('hardware.optocoupler.primary.measurement_duration')
+            # Measurement duration is cached at startup
+            measurement_duration = self.measurement_duration
             
             # Initialize pulse injector state before starting measurements
             if simulator_mode and USE_PULSE_INJECTION_IN_SIMULATOR and self.pulse_injector:
@@ -1578,7 +1679,7 @@ class FrequencyMonitor:
                 self.measurement_in_progress = True
             
             while self.running:
-                current_time = time.time()
+                current_time_ns = time.monotonic_ns()
                 
                 # 1. Update pulse injector state if using mock (before acquiring reading)
                 if simulator_mode and USE_PULSE_INJECTION_IN_SIMULATOR and self.pulse_injector:
@@ -1594,8 +1695,13 @@ class FrequencyMonitor:
                 if self.has_new_reading:
                     validated_freq = self._process_frequency_reading(freq, measurement_duration)
                     
-                    # 3. Analyze and classify
-                    source, analysis_results = self._analyze_and_classify(validated_freq)
+                    # 3. Analyze and classify (at most once per analysis_interval; a lost signal is always handled)
+                    if validated_freq is None or current_time_ns - self.last_analysis_time_ns >= self.analysis_interval_ns:
+                        source, analysis_results = self._analyze_and_classify(validated_freq)
+                        self.last_analysis_time_ns = current_time_ns
+                        self.last_analysis_results = analysis_results
+                    else:
+                        source, analysis_results = self.last_source, self.last_analysis_results
                     
                     # 4. Update state machines
                     current_states = self._update_state_machines(validated_freq, source)
@@ -1612,13 +1718,14 @@ class FrequencyMonitor:
                     analysis_results = {}
                 
                 # 6. Periodic tasks (always run)
-                self._handle_periodic_tasks(current_time, self.last_freq, self.last_source, analysis_results)
+                self._handle_periodic_tasks(current_time_ns, self.last_freq, self.last_source, analysis_results)
                 
                 # 7. Systemd watchdog
                 self._sd_notify("WATCHDOG=1")
                 
-                # 8. Memory monitoring and cleanup (run every N iterations to reduce CPU)
-                if self.loop_iteration_count % self.memory_monitoring_interval == 0:
+                # 8. Memory monitoring and cleanup (every memory_check_interval seconds)
+                if current_time_ns - self.last_memory_check_ns >= self.memory_check_interval_ns:
+                    self.last_memory_check_ns = current_time_ns
                     try:
                         memory_info = self.memory_monitor.get_memory_info()
                         self.memory_monitor.check_memory_thresholds(memory_info)
@@ -1628,8 +1735,8 @@ class FrequencyMonitor:
                 
                 # 9. Check reset button (debounced, check every 0.5 seconds)
                 try:
-                    if current_time - self.last_reset_check >= 0.5:
-                        self.last_reset_check = current_time
+                    if current_time_ns - self.last_reset_check_ns >= NS_PER_SECOND // 2:
+                        self.last_reset_check_ns = current_time_ns
                         if self.hardware is not None and self.hardware.check_reset_button():
                             if not self.reset_button_pressed:
                                 self.reset_button_pressed = True
@@ -1662,12 +1769,7 @@ class FrequencyMonitor:
     
     def _get_power_source_indicator(self, source: str) -> str:
         """Convert power source classification to U/G indicator."""
-        if source == "Utility Grid":
-            return "Util"
-        elif source == "Generac Generator":
-            return "Gen"
-        else:
-            return "?"  # Unknown
+        return SOURCE_INDICATORS.get(source, "?")
 
     def _clear_buffers(self):
         """Clear frequency and time buffers to ensure fresh analysis."""
@@ -1690,30 +1792,28 @@ class FrequencyMonitor:
             
             # Check frequency buffer
             if len(self.freq_buffer) > 0:
-                freq_list = list(self.freq_buffer)
+                freqs = self.freq_buffer.as_ndarray_view()
                 
                 # Check for NaN or infinite values
-                for i, freq in enumerate(freq_list):
-                    if freq is not None and (np.isnan(freq) or np.isinf(freq)):
-                        self.logger.error(f"Buffer corruption detected: NaN/inf value at index {i}: {freq}")
-                        corruption_detected = True
-                        break
+                invalid = np.flatnonzero(~np.isfinite(freqs))
+                if invalid.size > 0:
+                    i = int(invalid[0])
+                    self.logger.error(f"Buffer corruption detected: NaN/inf value at index {i}: {freqs[i]}")
+                    corruption_detected = True
                 
                 # Check for sudden jumps (more than 10Hz change)
-                if len(freq_list) >= 2 and not corruption_detected:
-                    for i in range(1, len(freq_list)):
-                        if (freq_list[i] is not None and freq_list[i-1] is not None and 
-                            abs(freq_list[i] - freq_list[i-1]) > 10.0):
-                            self.logger.warning(f"Buffer anomaly: large frequency jump at index {i}: {freq_list[i-1]} -> {freq_list[i]}")
+                if len(freqs) >= 2 and not corruption_detected:
+                    for i in np.flatnonzero(np.abs(np.diff(freqs)) > 10.0) + 1:
+                        self.logger.warning(f"Buffer anomaly: large frequency jump at index {i}: {freqs[i-1]} -> {freqs[i]}")
             
             # Check time buffer monotonicity
-            if len(self.time_buffer) > 0:
-                time_list = list(self.time_buffer)
-                for i in range(1, len(time_list)):
-                    if time_list[i] <= time_list[i-1]:
-                        self.logger.error(f"Buffer corruption detected: non-monotonic time at index {i}: {time_list[i-1]} -> {time_list[i]}")
-                        corruption_detected = True
-                        break
+            if len(self.time_buffer) > 1:
+                times = self.time_buffer.as_ndarray_view()
+                non_monotonic = np.flatnonzero(np.diff(times) <= 0)
+                if non_monotonic.size > 0:
+                    i = int(non_monotonic[0]) + 1
+                    self.logger.error(f"Buffer corruption detected: non-monotonic time at index {i}: {times[i-1]} -> {times[i]}")
+                    corruption_detected = True
             
             # Clear buffers if corruption detected
             if corruption_detected:
@@ -7,10 +7,52 @@ Handles analysis of detailed log files and generates comprehensive reports.
 import csv
 import logging
 import os
+from itertools import islice, repeat
 from typing import Dict, List, Any, Optional
 import numpy as np
 
 
+# Detailed log columns (see DataLogger._initialize_detailed_log_file), grouped by how they are parsed
+STRING_COLUMNS = ('timestamp', 'datetime', 'power_source')
+FLOAT_COLUMNS = ('unix_timestamp', 'elapsed_seconds', 'frequency_hz', 'confidence')
+OPTIONAL_FLOAT_COLUMNS = ('allan_variance', 'std_deviation', 'kurtosis')  # 'N/A' is read as NaN
+INT_COLUMNS = ('sample_count', 'buffer_size')
+READ_CHUNK_ROWS = 50000  # Rows held as Python strings at once while parsing a log
+
+# (heading, results key) for each summary section of the report, in output order
+REPORT_SECTIONS = (
+    ('FREQUENCY STATISTICS', 'frequency_statistics'),
+    ('TIME ANALYSIS', 'time_analysis'),
+    ('CLASSIFICATION STATISTICS', 'classification_statistics'),
+    ('CONFIDENCE STATISTICS', 'confidence_statistics'),
+    ('ANALYSIS METRICS', 'analysis_metrics'),
+    ('THRESHOLD ANALYSIS', 'threshold_analysis'),
+    ('RECOMMENDED THRESHOLDS', 'recommended_thresholds'),
+)
+
+
+def _summary_stats(values: np.ndarray):
+    """Return (mean, population std, min, max), reusing the mean for the std instead of np.std recomputing it."""
+    mean = values.mean()
+    deviations = values - mean
+    std = np.sqrt(np.dot(deviations, deviations) / values.size)
+    return float(mean), float(std), float(values.min()), float(values.max())
+
+
+def _percentile_95_and_max(values: np.ndarray):
+    """Return (95th percentile, max) from one O(n) partition instead of a sort plus a separate max.
+    
+    The percentile uses np.percentile's default linear interpolation.
+    """
+    last = values.size - 1
+    position = 0.95 * last
+    lower = int(position)
+    upper = min(lower + 1, last)
+    part = np.partition(values, (lower, upper, last))
+    p95 = part[lower] + (part[upper] - part[lower]) * (position - lower)
+    return float(p95), float(part[last])
+
+
 class OfflineAnalyzer:
     """Analyzes offline frequency monitoring data from detailed log files."""
     
@@ -33,13 +75,13 @@ class OfflineAnalyzer:
                 self.logger.error("No data found in input file")
                 return
             
-            self.logger.info(f"Loaded {len(data)} data points from {input_file}")
+            self.logger.info(f"Loaded {len(data['frequency_hz'])} data points from {input_file}")
             
             # Perform analysis
             analysis_results = self._perform_offline_analysis(data)
             
             # Write results
-            self._write_analysis_results(analysis_results, output_file)
+            self._write_analysis_results(analysis_results, output_file, data)
             
             # Print summary
             self._print_analysis_summary(analysis_results)
@@ -47,58 +89,97 @@ class OfflineAnalyzer:
         except Exception as e:
             self.logger.error(f"Error during offline analysis: {e}")
     
-    def _read_detailed_log_file(self, filename: str) -> List[Dict[str, Any]]:
-        """Read detailed log file and return structured data."""
-        data = []
+    def _read_detailed_log_file(self, filename: str) -> Dict[str, np.ndarray]:
+        """Read detailed log file into one NumPy array per column.
         
+        The file is parsed in chunks of READ_CHUNK_ROWS rows, converting a whole
+        column of each chunk at a time, so only one chunk is ever held as Python
+        strings. 'N/A' metric values become NaN. Returns an empty dict when there is no data.
+        """
+        chunks = []
         try:
             with open(filename, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                
-                for row in reader:
-                    # Parse and validate data
-                    try:
-                        data_point = {
-                            'timestamp': row['timestamp'],
-                            'datetime': row['datetime'],
-                            'unix_timestamp': float(row['unix_timestamp']),
-                            'elapsed_seconds': float(row['elapsed_seconds']),
-                            'frequency_hz': float(row['frequency_hz']),
-                            'allan_variance': float(row['allan_variance']) if row['allan_variance'] != 'N/A' else None,
-                            'std_deviation': float(row['std_deviation']) if row['std_deviation'] != 'N/A' else None,
-                            'kurtosis': float(row['kurtosis']) if row['kurtosis'] != 'N/A' else None,
-                            'power_source': row['power_source'],
-                            'confidence': float(row['confidence']),
-                            'sample_count': int(row['sample_count']),
-                            'buffer_size': int(row['buffer_size'])
-                        }
-                        data.append(data_point)
-                    except (ValueError, KeyError) as e:
-                        self.logger.warning(f"Skipping invalid row: {e}")
-                        continue
-                        
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header:
+                    return {}
+                while True:
+                    rows = list(islice(reader, READ_CHUNK_ROWS))
+                    if not rows:
+                        break
+                    columns = self._parse_rows(header, rows)
+                    if columns:
+                        chunks.append(columns)
         except Exception as e:
             self.logger.error(f"Error reading log file: {e}")
-            return []
+            return {}
+        
+        if not chunks:
+            return {}
+        if len(chunks) == 1:
+            return chunks[0]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    
+    def _parse_rows(self, header: List[str], rows: List[List[str]]) -> Dict[str, np.ndarray]:
+        """Convert a block of rows to columns, dropping (and logging) any invalid rows."""
+        try:
+            return self._rows_to_columns(header, rows)
+        except (ValueError, KeyError):
+            pass
+        
+        # Some row is malformed: validate rows individually so only the bad ones are dropped
+        valid_rows = []
+        for row in rows:
+            try:
+                self._rows_to_columns(header, [row])
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Skipping invalid row: {e}")
+                continue
+            valid_rows.append(row)
         
-        return data
+        if not valid_rows:
+            return {}
+        return self._rows_to_columns(header, valid_rows)
+    
+    def _rows_to_columns(self, header: List[str], rows: List[List[str]]) -> Dict[str, np.ndarray]:
+        """Convert CSV rows to typed column arrays (raises ValueError/KeyError on bad data)."""
+        missing = [name for name in STRING_COLUMNS + FLOAT_COLUMNS + OPTIONAL_FLOAT_COLUMNS + INT_COLUMNS
+                   if name not in header]
+        if missing:
+            raise KeyError(f"Missing required log columns: {missing}")
+        
+        if any(len(row) != len(header) for row in rows):
+            raise ValueError(f"expected {len(header)} fields per row")
+        
+        columns = {}
+        for name, values in zip(header, zip(*rows)):  # Keep the file's column order
+            if name in FLOAT_COLUMNS:
+                columns[name] = np.array(values, dtype=np.float64)
+            elif name in OPTIONAL_FLOAT_COLUMNS:
+                columns[name] = np.array(['nan' if v == 'N/A' else v for v in values], dtype=np.float64)
+            elif name in INT_COLUMNS:
+                columns[name] = np.array(values, dtype=np.int64)
+            else:
+                columns[name] = np.array(values)
+        return columns
     
-    def _perform_offline_analysis(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _perform_offline_analysis(self, data: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """Perform comprehensive offline analysis on the data."""
         if not data:
             return {}
         
         # Extract frequency data
-        frequencies = np.array([d['frequency_hz'] for d in data])
-        timestamps = np.array([d['unix_timestamp'] for d in data])
+        frequencies = data['frequency_hz']
+        timestamps = data['unix_timestamp']
         
         # Basic statistics
+        freq_mean, freq_std, freq_min, freq_max = _summary_stats(frequencies)
         freq_stats = {
-            'mean': float(np.mean(frequencies)),
-            'std': float(np.std(frequencies)),
-            'min': float(np.min(frequencies)),
-            'max': float(np.max(frequencies)),
-            'range': float(np.max(frequencies) - np.min(frequencies)),
+            'mean': freq_mean,
+            'std': freq_std,
+            'min': freq_min,
+            'max': freq_max,
+            'range': freq_max - freq_min,
             'count': len(frequencies)
         }
         
@@ -107,10 +188,10 @@ class OfflineAnalyzer:
         sample_rate = len(frequencies) / duration if duration > 0 else 0
         
         # Classification analysis
-        classifications = [d['power_source'] for d in data]
-        utility_count = classifications.count('Utility Grid')
-        generator_count = classifications.count('Generac Generator')
-        unknown_count = classifications.count('Unknown')
+        classifications = data['power_source']
+        utility_count = int(np.count_nonzero(classifications == 'Utility Grid'))
+        generator_count = int(np.count_nonzero(classifications == 'Generac Generator'))
+        unknown_count = int(np.count_nonzero(classifications == 'Unknown'))
         
         classification_stats = {
             'utility_count': utility_count,
@@ -122,26 +203,32 @@ class OfflineAnalyzer:
         }
         
         # Confidence analysis
-        confidences = [d['confidence'] for d in data if d['confidence'] is not None]
+        confidences = data['confidence']
+        conf_mean, conf_std, conf_min, conf_max = _summary_stats(confidences) if confidences.size else (0, 0, 0, 0)
         confidence_stats = {
-            'mean_confidence': float(np.mean(confidences)) if confidences else 0,
-            'std_confidence': float(np.std(confidences)) if confidences else 0,
-            'min_confidence': float(np.min(confidences)) if confidences else 0,
-            'max_confidence': float(np.max(confidences)) if confidences else 0
+            'mean_confidence': conf_mean,
+            'std_confidence': conf_std,
+            'min_confidence': conf_min,
+            'max_confidence': conf_max
         }
         
         # Analysis metrics
-        allan_variances = [d['allan_variance'] for d in data if d['allan_variance'] is not None]
-        std_deviations = [d['std_deviation'] for d in data if d['std_deviation'] is not None]
-        kurtoses = [d['kurtosis'] for d in data if d['kurtosis'] is not None]
+        # Metrics logged as 'N/A' were read as NaN; keep only the measured values
+        allan_variances = data['allan_variance'][~np.isnan(data['allan_variance'])]
+        std_deviations = data['std_deviation'][~np.isnan(data['std_deviation'])]
+        kurtoses = data['kurtosis'][~np.isnan(data['kurtosis'])]
+        
+        avar_p95, avar_max = _percentile_95_and_max(allan_variances) if allan_variances.size else (None, 0)
+        std_p95, std_max = _percentile_95_and_max(std_deviations) if std_deviations.size else (None, 0)
+        kurt_p95, kurt_max = _percentile_95_and_max(kurtoses) if kurtoses.size else (None, 0)
         
         analysis_metrics = {
-            'mean_allan_variance': float(np.mean(allan_variances)) if allan_variances else 0,
-            'mean_std_deviation': float(np.mean(std_deviations)) if std_deviations else 0,
-            'mean_kurtosis': float(np.mean(kurtoses)) if kurtoses else 0,
-            'max_allan_variance': float(np.max(allan_variances)) if allan_variances else 0,
-            'max_std_deviation': float(np.max(std_deviations)) if std_deviations else 0,
-            'max_kurtosis': float(np.max(kurtoses)) if kurtoses else 0
+            'mean_allan_variance': float(np.mean(allan_variances)) if allan_variances.size else 0,
+            'mean_std_deviation': float(np.mean(std_deviations)) if std_deviations.size else 0,
+            'mean_kurtosis': float(np.mean(kurtoses)) if kurtoses.size else 0,
+            'max_allan_variance': avar_max,
+            'max_std_deviation': std_max,
+            'max_kurtosis': kurt_max
         }
         
         # Threshold analysis
@@ -151,9 +238,9 @@ class OfflineAnalyzer:
         kurt_thresh = thresholds.get('kurtosis', 0.5)
         
         # Count how many readings would be classified as generator based on each metric
-        avar_above_thresh = sum(1 for av in allan_variances if av > avar_thresh)
-        std_above_thresh = sum(1 for sd in std_deviations if sd > std_thresh)
-        kurt_above_thresh = sum(1 for k in kurtoses if k > kurt_thresh)
+        avar_above_thresh = int(np.count_nonzero(allan_variances > avar_thresh))
+        std_above_thresh = int(np.count_nonzero(std_deviations > std_thresh))
+        kurt_above_thresh = int(np.count_nonzero(kurtoses > kurt_thresh))
         
         threshold_analysis = {
             'allan_variance_threshold': avar_thresh,
@@ -162,31 +249,16 @@ class OfflineAnalyzer:
             'allan_variance_above_threshold': avar_above_thresh,
             'std_deviation_above_threshold': std_above_thresh,
             'kurtosis_above_threshold': kurt_above_thresh,
-            'allan_variance_above_percentage': (avar_above_thresh / len(allan_variances)) * 100 if allan_variances else 0,
-            'std_deviation_above_percentage': (std_above_thresh / len(std_deviations)) * 100 if std_deviations else 0,
-            'kurtosis_above_percentage': (kurt_above_thresh / len(kurtoses)) * 100 if kurtoses else 0
+            'allan_variance_above_percentage': (avar_above_thresh / len(allan_variances)) * 100 if allan_variances.size else 0,
+            'std_deviation_above_percentage': (std_above_thresh / len(std_deviations)) * 100 if std_deviations.size else 0,
+            'kurtosis_above_percentage': (kurt_above_thresh / len(kurtoses)) * 100 if kurtoses.size else 0
         }
         
-        # Recommended thresholds based on data
-        if allan_variances:
-            recommended_avar = np.percentile(allan_variances, 95)
-        else:
-            recommended_avar = avar_thresh
-            
-        if std_deviations:
-            recommended_std = np.percentile(std_deviations, 95)
-        else:
-            recommended_std = std_thresh
-            
-        if kurtoses:
-            recommended_kurt = np.percentile(kurtoses, 95)
-        else:
-            recommended_kurt = kurt_thresh
-        
+        # Recommended thresholds based on data (current threshold when a metric was never measured)
         recommended_thresholds = {
-            'recommended_allan_variance': recommended_avar,
-            'recommended_std_deviation': recommended_std,
-            'recommended_kurtosis': recommended_kurt
+            'recommended_allan_variance': avar_p95 if avar_p95 is not None else avar_thresh,
+            'recommended_std_deviation': std_p95 if std_p95 is not None else std_thresh,
+            'recommended_kurtosis': kurt_p95 if kurt_p95 is not None else kurt_thresh
         }
         
         return {
@@ -201,74 +273,36 @@ class OfflineAnalyzer:
             'confidence_statistics': confidence_stats,
             'analysis_metrics': analysis_metrics,
             'threshold_analysis': threshold_analysis,
-            'recommended_thresholds': recommended_thresholds,
-            'raw_data': data  # Include raw data for detailed analysis
+            'recommended_thresholds': recommended_thresholds
         }
     
-    def _write_analysis_results(self, results: Dict[str, Any], output_file: str):
-        """Write analysis results to CSV file."""
+    def _write_analysis_results(self, results: Dict[str, Any], output_file: str,
+                                data: Optional[Dict[str, np.ndarray]] = None):
+        """Write analysis results to CSV file, followed by the raw data columns if given."""
         try:
             with open(output_file, 'w', newline='') as f:
                 writer = csv.writer(f)
                 
-                # Write summary statistics
-                writer.writerow(['Analysis Type', 'Metric', 'Value'])
-                writer.writerow([])
-                
-                # Frequency statistics
-                writer.writerow(['FREQUENCY STATISTICS', '', ''])
-                for key, value in results['frequency_statistics'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Time analysis
-                writer.writerow(['TIME ANALYSIS', '', ''])
-                for key, value in results['time_analysis'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Classification statistics
-                writer.writerow(['CLASSIFICATION STATISTICS', '', ''])
-                for key, value in results['classification_statistics'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Confidence statistics
-                writer.writerow(['CONFIDENCE STATISTICS', '', ''])
-                for key, value in results['confidence_statistics'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Analysis metrics
-                writer.writerow(['ANALYSIS METRICS', '', ''])
-                for key, value in results['analysis_metrics'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Threshold analysis
-                writer.writerow(['THRESHOLD ANALYSIS', '', ''])
-                for key, value in results['threshold_analysis'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
-                
-                # Recommended thresholds
-                writer.writerow(['RECOMMENDED THRESHOLDS', '', ''])
-                for key, value in results['recommended_thresholds'].items():
-                    writer.writerow(['', key, value])
-                writer.writerow([])
+                # Summary sections are collected first and written in one writerows() call
+                rows = [['Analysis Type', 'Metric', 'Value'], []]
+                for title, section in REPORT_SECTIONS:
+                    rows.append([title, '', ''])
+                    rows.extend(['', key, value] for key, value in results[section].items())
+                    rows.append([])
+                writer.writerows(rows)
                 
                 # Raw data section
                 writer.writerow(['RAW DATA', '', ''])
-                if results.get('raw_data'):
+                if data:
                     # Write header for raw data
-                    raw_data = results['raw_data']
-                    if raw_data:
-                        headers = list(raw_data[0].keys())
-                        writer.writerow([''] + headers)
-                        
-                        # Write raw data rows
-                        for row in raw_data:
-                            writer.writerow([''] + [row.get(header, '') for header in headers])
+                    headers = list(data.keys())
+                    writer.writerow([''] + headers)
+                    
+                    # Stream rows straight from the columns (missing metrics are left blank)
+                    values = [np.where(np.isnan(data[h]), None, data[h]).tolist()
+                              if data[h].dtype.kind == 'f' else data[h].tolist()
+                              for h in headers]
+                    writer.writerows(zip(repeat(''), *values))
             
             self.logger.info(f"Analysis results written to {output_file}")
             
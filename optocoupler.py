@@ -7,10 +7,8 @@ Handles pulse counting and frequency calculation with graceful degradation.
 import logging
 import time
 import threading
-import os
-import statistics
-from typing import Optional, Tuple, List, Dict, Any
-import psutil
+from types import MappingProxyType
+from typing import Optional, Tuple, List, Dict, Any, Mapping
 import numpy as np
 
 # Hardware imports with graceful degradation
@@ -29,45 +27,101 @@ from gpio_event_counter import create_counter
 ENABLE_REGRESSION_COMPARISON = True
 # Set USE_REGRESSION_FOR_RESULT = True to return regression result instead of standard result
 USE_REGRESSION_FOR_RESULT = False
+# The comparison is logged as a summary (mean/max difference) once per this many measurements
+REGRESSION_COMPARISON_LOG_INTERVAL = 30
+
+# Computed frequencies outside this range are treated as glitches and discarded
+MIN_VALID_FREQUENCY = 40.0
+MAX_VALID_FREQUENCY = 80.0
+# Out-of-range warnings are logged at most once per this many seconds per optocoupler and method
+OUT_OF_RANGE_WARN_INTERVAL = 1.0
+
+# Measurement windows are timed on CLOCK_MONOTONIC_RAW, which NTP cannot slew
+_MONO_RAW = getattr(time, 'CLOCK_MONOTONIC_RAW', None)
+
+
+def _now_ns() -> int:
+    """Current CLOCK_MONOTONIC_RAW time in ns (perf_counter_ns where unavailable)."""
+    if _MONO_RAW is not None:
+        return time.clock_gettime_ns(_MONO_RAW)
+    return time.perf_counter_ns()
 
 
 class SingleOptocoupler:
     """Manages a single optocoupler for frequency measurement using working libgpiod."""
     
+    # Fixed attribute set: no per-instance __dict__, and slot reads on the measurement path
+    __slots__ = (
+        'config', 'logger', 'name', 'pin', 'pulses_per_cycle', '_inv_pulses_per_cycle', '_freq_scale_ns', '_pulses_per_second', '_expected_interval_us',
+        'measurement_duration',
+        'gpio_available', 'mock_gpiod_available', 'initialized', 'counter', '_get_count', '_reset_count',
+        '_timestamp_buf', '_index_cache', '_last_freq_info',
+        '_comp_log_count', '_comp_diff_pct_sum', '_comp_diff_pct_max',
+        'consecutive_errors', 'max_consecutive_errors', 'last_successful_count',
+        'health_check_interval_ns', '_next_health_check_ns', 'recovery_attempts', 'max_recovery_attempts',
+        'measurement_active', 'measurement_start_ns', 'measurement_window', 'measurement_lock', '_stop_event',
+        '_next_range_warn_ns',
+    )
+    
     def __init__(self, config, logger: logging.Logger, name: str, pin: int, 
-                 pulses_per_cycle: int = 2, measurement_duration: float = 2.0):
+                 pulses_per_cycle: int = 2, measurement_duration: float = 2.0,
+                 max_consecutive_errors: int = 5, health_check_interval: float = 30.0,
+                 max_recovery_attempts: int = 3):
         self.config = config
         self.logger = logger
         self.name = name
         self.pin = pin
         self.pulses_per_cycle = pulses_per_cycle
+        # Fixed per optocoupler, so the frequency formulas multiply by the reciprocal instead of dividing
+        self._inv_pulses_per_cycle = 1.0 / float(pulses_per_cycle)
+        # Intervals per ns -> Hz (5e8 for the H11AA1's 2 pulses per cycle)
+        self._freq_scale_ns = 1e9 / float(pulses_per_cycle)
+        # Expected pulse rate and spacing at nominal 60Hz, used for the loss/interval diagnostics
+        self._pulses_per_second = 60 * pulses_per_cycle
+        self._expected_interval_us = 1_000_000.0 / self._pulses_per_second
         self.measurement_duration = measurement_duration
         self.gpio_available = GPIO_AVAILABLE
         
-        # Optocoupler pulse counting
-        self.pulse_count = 0
-        self.pulse_count_lock = threading.Lock()
-        self.last_timestamps = []
+        # Pulses are counted by self.counter (libgpiod event thread), never in Python
         self.initialized = False
         
         # Error tracking and recovery
         self.consecutive_errors = 0
-        self.max_consecutive_errors = config.get('hardware.optocoupler.max_consecutive_errors')
+        self.max_consecutive_errors = int(max_consecutive_errors)
         self.last_successful_count = 0
-        self.last_health_check = time.time()
-        self.health_check_interval = config.get('hardware.optocoupler.health_check_interval')  # seconds
+        # Integer ns on the same monotonic clock as the measurement windows, so the gate is one int compare
+        self.health_check_interval_ns = int(health_check_interval * 1e9)
+        self._next_health_check_ns = _now_ns() + self.health_check_interval_ns
         self.recovery_attempts = 0
-        self.max_recovery_attempts = config.get('hardware.optocoupler.max_recovery_attempts')
+        self.max_recovery_attempts = int(max_recovery_attempts)
+        # A sustained glitch fails every measurement; this keeps it from flooding the log.
+        # Next allowed warning time per method, so one method's warnings can't hide the other's
+        self._next_range_warn_ns: Dict[str, int] = {'regression': 0, 'first_last': 0}
         
         # Non-blocking measurement state
         self.measurement_active = False
-        self.measurement_start_time = None
-        self.measurement_duration = None
+        self.measurement_start_ns = None
+        self.measurement_window = None  # Duration of the active window; measurement_duration stays the default
         self.measurement_lock = threading.Lock()
+        # Set by cleanup() so a blocking measurement wakes up instead of finishing its window
+        self._stop_event = threading.Event()
         
         # Initialize GIL-safe counter (required)
         counter_start = time.perf_counter()
         self.counter = create_counter(self.logger)
+        # Bound once so the measurement path skips the counter attribute/method lookups
+        self._get_count = self.counter.get_count
+        self._reset_count = self.counter.reset_count
+        # Reused for regression; sized for a full window at up to 80 Hz and grown by the counter if needed
+        self._timestamp_buf = np.empty(int(measurement_duration * 80 * pulses_per_cycle) + 1, dtype=np.int64)
+        # Pulse indices 0..N-1 for the regression, sliced per measurement and grown when a window is longer
+        self._index_cache = np.arange(self._timestamp_buf.size, dtype=np.float64)
+        # (count, first_ns, last_ns) read at the end of the last measurement; cleared on every counter reset
+        self._last_freq_info = None
+        # Regression vs first/last differences, summarised every REGRESSION_COMPARISON_LOG_INTERVAL measurements
+        self._comp_log_count = 0
+        self._comp_diff_pct_sum = 0.0
+        self._comp_diff_pct_max = 0.0
         counter_duration = (time.perf_counter() - counter_start) * 1000
         self.logger.info(f"[COUNTER_INIT] GIL-safe counter initialized for {self.name} in {counter_duration:.1f}ms")
         
@@ -86,7 +140,7 @@ class SingleOptocoupler:
                         self.logger.info(f"[OPTO_INIT] Mock gpiod detected for {self.name}")
                     test_chip.close()
             except Exception as e:
-                self.logger.debug(f"[OPTO_INIT] Could not detect mock gpiod: {e}")
+                self.logger.debug("[OPTO_INIT] Could not detect mock gpiod: %s", e)
                 pass
         
         # Setup optocoupler if we have GPIO (real or mock)
@@ -143,8 +197,9 @@ class SingleOptocoupler:
             self.logger.warning(f"{self.name} optocoupler not initialized, cannot start measurement")
             return False
         
-        # Check health before measurement
-        if not self.check_health():
+        # Check health before measurement (only when the periodic check is due)
+        now_ns = _now_ns()
+        if now_ns >= self._next_health_check_ns and not self._do_health_check(now_ns):
             self.logger.warning(f"{self.name} optocoupler unhealthy, cannot start measurement")
             return False
         
@@ -152,51 +207,58 @@ class SingleOptocoupler:
             duration = self.measurement_duration
         
         # Calculate expected pulse count for comparison
-        expected_pulses = int(duration * 60 * self.pulses_per_cycle)  # 60Hz * pulses_per_cycle * duration
+        expected_pulses = int(duration * self._pulses_per_second)  # 60Hz * pulses_per_cycle * duration
         
-        # Track lock acquisition time
-        lock_start = time.perf_counter()
-        with self.measurement_lock:
-            lock_duration = (time.perf_counter() - lock_start) * 1000
-            if lock_duration > 10.0:  # Warn if >10ms
-                self.logger.warning(f"[NB_MEASURE] {self.name} measurement_lock acquisition took {lock_duration:.2f}ms - possible contention")
-            
+        # Only the check-and-set of the active flag needs the lock; if another
+        # caller holds it, a measurement is being started or read, so don't queue
+        if not self.measurement_lock.acquire(blocking=False):
+            self.logger.debug("[NB_MEASURE] %s measurement_lock busy, skipping start", self.name)
+            return False
+        try:
             # If a measurement is already active, don't start a new one
             if self.measurement_active:
-                self.logger.debug(f"[NB_MEASURE] {self.name} measurement already active, skipping start")
+                self.logger.debug("[NB_MEASURE] %s measurement already active, skipping start", self.name)
                 return False
+            # Claim the window; the start time is moved to the reset below, so a
+            # concurrent check_measurement sees it as still in progress
+            self.measurement_window = duration
+            self.measurement_start_ns = _now_ns()
+            self.measurement_active = True
+        finally:
+            self.measurement_lock.release()
+        
+        # The step timings only feed INFO logs, so skip those clock reads when it's off
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
+        
+        try:
+            # Get pulse count before reset
+            if info_enabled:
+                pulse_count_before_reset = self._get_count(self.pin)
+                self.logger.info("[NB_MEASURE_START] %s duration=%.2fs expected_pulses=~%d count_before_reset=%s time=%.3f", self.name, duration, expected_pulses, pulse_count_before_reset, time.perf_counter())
             
-            try:
-                # Get pulse count before reset
-                pulse_count_before_reset = self.counter.get_count(self.pin)
-                start_time = time.perf_counter()
-                self.logger.info(f"[NB_MEASURE_START] {self.name} duration={duration:.2f}s expected_pulses=~{expected_pulses} count_before_reset={pulse_count_before_reset} time={start_time:.3f}")
-                
-                # Reset counter before measurement
-                reset_start = time.perf_counter()
-                self.counter.reset_count(self.pin)
-                reset_end = time.perf_counter()
-                reset_duration_ms = (reset_end - reset_start) * 1000
-                self.logger.info(f"[NB_RESET_COMPLETE] {self.name} reset_took={reset_duration_ms:.2f}ms")
-                
-                # Get pulse count immediately after reset (should be 0)
-                pulse_count_after_reset = self.counter.get_count(self.pin)
-                if pulse_count_after_reset != 0:
-                    self.logger.warning(f"[NB_RESET_VERIFY] {self.name} count after reset is {pulse_count_after_reset}, expected 0!")
-                
-                # Record measurement start time and duration
-                self.measurement_start_time = time.perf_counter()
-                self.measurement_duration = duration
-                self.measurement_active = True
-                
-                time_since_reset = (self.measurement_start_time - reset_end) * 1000
-                self.logger.info(f"[NB_MEASURE_ACTIVE] {self.name} measurement started, time_since_reset={time_since_reset:.2f}ms")
-                return True
-                
-            except Exception as e:
-                self.logger.error(f"[NB_MEASURE] {self.name} failed to start measurement: {e}")
+            # Reset counter before measurement
+            reset_start_ns = _now_ns()
+            self._reset_count(self.pin)
+            self._last_freq_info = None
+            # Pulses accumulate from the reset, so the window is anchored there
+            reset_end_ns = self.measurement_start_ns = _now_ns()
+            if info_enabled:
+                self.logger.info("[NB_RESET_COMPLETE] %s reset_took=%.2fms", self.name, (reset_end_ns - reset_start_ns) / 1e6)
+            
+            # Get pulse count immediately after reset (should be 0)
+            pulse_count_after_reset = self._get_count(self.pin)
+            if pulse_count_after_reset != 0:
+                self.logger.warning(f"[NB_RESET_VERIFY] {self.name} count after reset is {pulse_count_after_reset}, expected 0!")
+            
+            if info_enabled:
+                self.logger.info("[NB_MEASURE_ACTIVE] %s measurement started, time_since_reset=%.2fms", self.name, (_now_ns() - reset_end_ns) / 1e6)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"[NB_MEASURE] {self.name} failed to start measurement: {e}")
+            with self.measurement_lock:
                 self.measurement_active = False
-                return False
+            return False
     
     def check_measurement(self) -> Tuple[bool, Optional[int], Optional[float]]:
         """
@@ -212,43 +274,36 @@ class SingleOptocoupler:
             if not self.measurement_active:
                 return (False, None, None)
             
-            current_time = time.perf_counter()
-            elapsed = current_time - self.measurement_start_time
+            elapsed = (_now_ns() - self.measurement_start_ns) / 1e9
             
             # Check if measurement window has elapsed
-            if elapsed < self.measurement_duration:
+            if elapsed < self.measurement_window:
                 # Still in progress
                 return (False, None, None)
             
             # Measurement complete - retrieve results
             try:
                 # Calculate expected pulse count for comparison
-                expected_pulses = int(self.measurement_duration * 60 * self.pulses_per_cycle)
-                
-                count_start = time.perf_counter()
-                pulse_count = self.counter.get_count(self.pin)
-                count_end = time.perf_counter()
-                count_duration_ms = (count_end - count_start) * 1000
+                expected_pulses = int(self.measurement_window * self._pulses_per_second)
                 
-                # Get frequency stats for additional logging
-                stat_count, t_first, t_last = self.counter.get_frequency_info(self.pin)
+                # Count, frequency stats and event statistics in one consistent read
+                # (skip expensive interval calculations unless debug logging is enabled)
+                pulse_count, stat_count, t_first, t_last, event_stats = self.counter.snapshot(
+                    self.pin, include_intervals=self.logger.isEnabledFor(logging.DEBUG))
+                self._last_freq_info = (stat_count, t_first, t_last)
                 
-                # Get event statistics for detailed analysis (skip expensive interval calculations for performance)
-                # Only include intervals if debug logging is enabled
-                include_intervals = self.logger.isEnabledFor(logging.DEBUG)
-                event_stats = self.counter.get_event_statistics(self.pin, include_intervals=include_intervals)
-                
-                self.logger.debug(f"[NB_COUNT_READ] {self.name} count={pulse_count} expected=~{expected_pulses} elapsed={elapsed:.3f}s count_took={count_duration_ms:.2f}ms")
+                self.logger.debug("[NB_COUNT_READ] %s count=%d expected=~%d elapsed=%.3fs",
+                                  self.name, pulse_count, expected_pulses, elapsed)
                 
                 if stat_count > 0:
                     stat_duration_ms = (t_last - t_first) / 1e6
-                    self.logger.info(f"[NB_FREQ_STATS] {self.name} stat_count={stat_count} duration={stat_duration_ms:.2f}ms first_ts={t_first} last_ts={t_last}")
+                    self.logger.info("[NB_FREQ_STATS] %s stat_count=%d duration=%.2fms first_ts=%s last_ts=%s", self.name, stat_count, stat_duration_ms, t_first, t_last)
                 else:
-                    self.logger.info(f"[NB_FREQ_STATS] {self.name} NO TIMESTAMPS COLLECTED!")
+                    self.logger.info("[NB_FREQ_STATS] %s NO TIMESTAMPS COLLECTED!", self.name)
                 
                 # Log event statistics if available
                 if event_stats:
-                    self.logger.info(f"[NB_EVENT_STATS] {self.name} received={event_stats['received']} debounced={event_stats['debounced']} accepted={event_stats['accepted']} count={event_stats['count']} timestamp_count={event_stats['timestamp_count']}")
+                    self.logger.info("[NB_EVENT_STATS] %s received=%s debounced=%s accepted=%s count=%s timestamp_count=%s", self.name, event_stats['received'], event_stats['debounced'], event_stats['accepted'], event_stats['count'], event_stats['timestamp_count'])
                     
                     # Compare pulse_count vs stat_count
                     if pulse_count != stat_count:
@@ -257,7 +312,7 @@ class SingleOptocoupler:
                     # Log interval statistics if available
                     if event_stats.get('intervals'):
                         intervals = event_stats['intervals']
-                        self.logger.info(f"[NB_INTERVAL_STATS] {self.name} count={intervals['count']} min={intervals['min_us']:.1f}us max={intervals['max_us']:.1f}us mean={intervals['mean_us']:.1f}us median={intervals['median_us']:.1f}us std_dev={intervals['std_dev_us']:.1f}us")
+                        self.logger.info("[NB_INTERVAL_STATS] %s count=%s min=%.1fus max=%.1fus mean=%.1fus median=%.1fus std_dev=%.1fus", self.name, intervals['count'], intervals['min_us'], intervals['max_us'], intervals['mean_us'], intervals['median_us'], intervals['std_dev_us'])
                 
                 # Validate pulse count
                 if pulse_count < 0:
@@ -268,19 +323,19 @@ class SingleOptocoupler:
                 
                 # Warn if count is much lower than expected
                 if pulse_count < expected_pulses * 0.5:
-                    self.logger.info(f"[NB_COUNT_LOW] {self.name} count={pulse_count} is less than 50% of expected={expected_pulses}")
+                    self.logger.info("[NB_COUNT_LOW] %s count=%d is less than 50%% of expected=%d", self.name, pulse_count, expected_pulses)
                 
                 # Calculate pulse loss percentage
                 pulse_loss_pct = (1.0 - (pulse_count / expected_pulses)) * 100 if expected_pulses > 0 else 0
                 if pulse_loss_pct > 5.0:  # Warn if more than 5% loss
-                    self.logger.info(f"[NB_PULSE_LOSS] {self.name} pulse_loss={pulse_loss_pct:.1f}% (expected={expected_pulses} got={pulse_count})")
+                    self.logger.info("[NB_PULSE_LOSS] %s pulse_loss=%.1f%% (expected=%d got=%d)", self.name, pulse_loss_pct, expected_pulses, pulse_count)
                 
                 # Reset error count on successful measurement
                 self.consecutive_errors = 0
                 self.last_successful_count = pulse_count
                 
                 rate = pulse_count / elapsed if elapsed > 0 else 0
-                self.logger.info(f"[NB_MEASURE_END] {self.name} count={pulse_count} elapsed={elapsed:.3f}s rate={rate:.1f}/s expected_rate=120.0/s loss={pulse_loss_pct:.1f}%")
+                self.logger.info("[NB_MEASURE_END] %s count=%d elapsed=%.3fs rate=%.1f/s expected_rate=120.0/s loss=%.1f%%", self.name, pulse_count, elapsed, rate, pulse_loss_pct)
                 
                 # Mark measurement as complete
                 self.measurement_active = False
@@ -305,14 +360,15 @@ class SingleOptocoupler:
         Returns:
             Tuple of (pulse_count, actual_elapsed_time) where:
             - pulse_count: Number of pulses counted
-            - actual_elapsed_time: Actual elapsed time in seconds (measured with time.perf_counter())
+            - actual_elapsed_time: Actual elapsed time in seconds (measured on CLOCK_MONOTONIC_RAW)
         """
         if not self.initialized:
             self.logger.warning(f"{self.name} optocoupler not initialized, cannot count pulses")
             return (0, 0.0)
         
-        # Check health before measurement
-        if not self.check_health():
+        # Check health before measurement (only when the periodic check is due)
+        now_ns = _now_ns()
+        if now_ns >= self._next_health_check_ns and not self._do_health_check(now_ns):
             self.logger.warning(f"{self.name} optocoupler unhealthy, skipping measurement")
             return (0, 0.0)
         
@@ -320,82 +376,90 @@ class SingleOptocoupler:
             duration = self.measurement_duration
         
         # Calculate expected pulse count for comparison
-        expected_pulses = int(duration * 60 * self.pulses_per_cycle)  # 60Hz * pulses_per_cycle * duration
+        expected_pulses = int(duration * self._pulses_per_second)  # 60Hz * pulses_per_cycle * duration
+        
+        # Checked once; the level can't usefully change within one measurement.
+        # The step timings below only feed INFO logs, so skip those clock reads when it's off
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
         
         try:
             # Log before reset
-            pulse_count_before_reset = self.counter.get_count(self.pin)
-            measure_start = time.perf_counter()
-            self.logger.info(f"[MEASURE_START] {self.name} duration={duration:.2f}s expected_pulses=~{expected_pulses} count_before_reset={pulse_count_before_reset} time={measure_start:.3f}")
+            if info_enabled:
+                pulse_count_before_reset = self._get_count(self.pin)
+                self.logger.info("[MEASURE_START] %s duration=%.2fs expected_pulses=~%d count_before_reset=%s time=%.3f", self.name, duration, expected_pulses, pulse_count_before_reset, time.perf_counter())
             
             # Reset counter before measurement
-            reset_start = time.perf_counter()
-            self.counter.reset_count(self.pin)
-            reset_end = time.perf_counter()
-            reset_duration_ms = (reset_end - reset_start) * 1000
-            self.logger.info(f"[RESET_COMPLETE] {self.name} reset_took={reset_duration_ms:.2f}ms")
+            if info_enabled:
+                reset_start_ns = _now_ns()
+            self._reset_count(self.pin)
+            self._last_freq_info = None
+            # Pulses accumulate from the reset, so the window is anchored there (not after the logging below)
+            window_start_ns = _now_ns()
+            deadline_ns = window_start_ns + int(duration * 1e9)
+            if info_enabled:
+                self.logger.info("[RESET_COMPLETE] %s reset_took=%.2fms", self.name, (window_start_ns - reset_start_ns) / 1e6)
             
             # Get pulse count immediately after reset (should be 0)
-            pulse_count_after_reset = self.counter.get_count(self.pin)
+            pulse_count_after_reset = self._get_count(self.pin)
             if pulse_count_after_reset != 0:
                 self.logger.warning(f"[RESET_VERIFY] {self.name} count after reset is {pulse_count_after_reset}, expected 0!")
             
             # Use libgpiod interrupt counting
-            sleep_start = time.perf_counter()
-            time_since_reset = (sleep_start - reset_end) * 1000
-            self.logger.info(f"[SLEEP_START] {self.name} time_since_reset={time_since_reset:.2f}ms, sleeping for {duration:.2f}s")
-            
-            # Wait for the specified duration - libgpiod handles counting in background
-            time.sleep(duration)
+            if info_enabled:
+                sleep_start_ns = _now_ns()
+                self.logger.info("[SLEEP_START] %s time_since_reset=%.2fms, sleeping for %.2fs", self.name, (sleep_start_ns - window_start_ns) / 1e6, duration)
             
-            sleep_end = time.perf_counter()
-            actual_sleep = (sleep_end - sleep_start) * 1000
-            sleep_deviation = actual_sleep - (duration * 1000)
-            self.logger.info(f"[SLEEP_END] {self.name} actual_sleep={actual_sleep:.2f}ms expected={duration*1000:.2f}ms deviation={sleep_deviation:.2f}ms")
+            # Wait until the deadline - libgpiod handles counting in background.
+            # No busy-spin to trim wakeup overshoot: it would hold the GIL while the event thread
+            # drains edges, and the frequency uses the measured elapsed time, not the nominal duration.
+            remaining = (deadline_ns - _now_ns()) / 1e9
+            if remaining > 0 and self._stop_event.wait(remaining):
+                self.logger.info("[MEASURE_ABORT] %s measurement interrupted by cleanup", self.name)
+                return (0, 0.0)
             
-            # Get final count from libgpiod
-            count_start = time.perf_counter()
-            pulse_count = self.counter.get_count(self.pin)
-            count_end = time.perf_counter()
-            count_duration_ms = (count_end - count_start) * 1000
-            total_time_since_reset = (count_end - reset_start) * 1000
+            if info_enabled:
+                count_start_ns = _now_ns()
+                actual_sleep = (count_start_ns - sleep_start_ns) / 1e6
+                expected_sleep = (deadline_ns - sleep_start_ns) / 1e6
+                self.logger.info("[SLEEP_END] %s actual_sleep=%.2fms expected=%.2fms deviation=%.2fms", self.name, actual_sleep, expected_sleep, actual_sleep - expected_sleep)
             
-            self.logger.info(f"[COUNT_READ] {self.name} count={pulse_count} expected=~{expected_pulses} time_since_reset={total_time_since_reset:.2f}ms count_took={count_duration_ms:.2f}ms")
+            # Get final count, frequency stats (count, first, last) and event statistics from
+            # libgpiod in one consistent read (interval statistics only if debug logging is enabled)
+            pulse_count, stat_count, t_first, t_last, event_stats = self.counter.snapshot(self.pin, include_intervals=debug_enabled)
+            window_end_ns = _now_ns()
+            elapsed = (window_end_ns - window_start_ns) / 1e9
             
-            # Retrieve frequency stats (count, first, last) directly to avoid list copy overhead
-            stat_count, t_first, t_last = self.counter.get_frequency_info(self.pin)
+            if info_enabled:
+                self.logger.info("[COUNT_READ] %s count=%d expected=~%d time_since_reset=%.2fms count_took=%.2fms",
+                                 self.name, pulse_count, expected_pulses, (window_end_ns - window_start_ns) / 1e6, (window_end_ns - count_start_ns) / 1e6)
             
-            # Get event statistics for detailed analysis (skip expensive interval calculations for performance)
-            # Only include intervals if debug logging is enabled
-            include_intervals = self.logger.isEnabledFor(logging.DEBUG)
-            event_stats = self.counter.get_event_statistics(self.pin, include_intervals=include_intervals)
+            self._last_freq_info = (stat_count, t_first, t_last)
             
             # Log frequency stats
             if stat_count > 0:
                 stat_duration_ms = (t_last - t_first) / 1e6
-                self.logger.info(f"[FREQ_STATS] {self.name} stat_count={stat_count} duration={stat_duration_ms:.2f}ms first_ts={t_first} last_ts={t_last}")
-                
-                # Calculate timing precision: reset to first pulse, last pulse to count read
-                # Convert reset_end to nanoseconds (approximate, using perf_counter reference)
-                # Note: t_first and t_last are in nanoseconds from kernel, reset_end is perf_counter
-                # We can't directly compare, but we can calculate dead time from measurement window
-                reset_to_first_ms = "N/A"  # Can't directly compare perf_counter to kernel timestamps
-                last_to_count_ms = "N/A"
+                self.logger.info("[FREQ_STATS] %s stat_count=%d duration=%.2fms first_ts=%s last_ts=%s", self.name, stat_count, stat_duration_ms, t_first, t_last)
                 
                 # Calculate dead time: time before first pulse and after last pulse within measurement window
-                # Measurement window: reset_end to count_end
-                measurement_window_ns = (count_end - reset_end) * 1e9
-                pulse_window_ns = t_last - t_first
-                dead_time_before_ns = t_first - (reset_end * 1e9)  # Approximate, may be negative if first pulse before reset
-                dead_time_after_ns = (count_end * 1e9) - t_last
-                
-                self.logger.debug(f"[TIMING_ANALYSIS] {self.name} measurement_window={measurement_window_ns/1e6:.2f}ms pulse_window={pulse_window_ns/1e6:.2f}ms dead_time_before={dead_time_before_ns/1e6:.2f}ms dead_time_after={dead_time_after_ns/1e6:.2f}ms")
+                # Measurement window: reset (window_start_ns) to count read (window_end_ns), both in ns
+                # like the kernel edge timestamps. The kernel stamps edges on CLOCK_MONOTONIC and the
+                # window is on CLOCK_MONOTONIC_RAW, so the dead times are only as exact as their NTP drift.
+                if debug_enabled:
+                    measurement_window_ns = window_end_ns - window_start_ns
+                    pulse_window_ns = t_last - t_first
+                    dead_time_before_ns = t_first - window_start_ns  # May be negative if first pulse before reset
+                    dead_time_after_ns = window_end_ns - t_last
+                    
+                    self.logger.debug("[TIMING_ANALYSIS] %s measurement_window=%.2fms pulse_window=%.2fms dead_time_before=%.2fms dead_time_after=%.2fms",
+                                      self.name, measurement_window_ns / 1e6, pulse_window_ns / 1e6,
+                                      dead_time_before_ns / 1e6, dead_time_after_ns / 1e6)
             else:
                 self.logger.warning(f"[FREQ_STATS] {self.name} NO TIMESTAMPS COLLECTED!")
             
             # Log event statistics if available
             if event_stats:
-                self.logger.info(f"[EVENT_STATS] {self.name} received={event_stats['received']} debounced={event_stats['debounced']} accepted={event_stats['accepted']} count={event_stats['count']} timestamp_count={event_stats['timestamp_count']}")
+                self.logger.info("[EVENT_STATS] %s received=%s debounced=%s accepted=%s count=%s timestamp_count=%s", self.name, event_stats['received'], event_stats['debounced'], event_stats['accepted'], event_stats['count'], event_stats['timestamp_count'])
                 
                 # Compare pulse_count vs stat_count
                 if pulse_count != stat_count:
@@ -404,18 +468,19 @@ class SingleOptocoupler:
                 # Log interval statistics if available
                 if event_stats.get('intervals'):
                     intervals = event_stats['intervals']
-                    self.logger.info(f"[INTERVAL_STATS] {self.name} count={intervals['count']} min={intervals['min_us']:.1f}us max={intervals['max_us']:.1f}us mean={intervals['mean_us']:.1f}us median={intervals['median_us']:.1f}us std_dev={intervals['std_dev_us']:.1f}us")
+                    self.logger.info("[INTERVAL_STATS] %s count=%s min=%.1fus max=%.1fus mean=%.1fus median=%.1fus std_dev=%.1fus", self.name, intervals['count'], intervals['min_us'], intervals['max_us'], intervals['mean_us'], intervals['median_us'], intervals['std_dev_us'])
                     
-                    # Calculate expected interval for 60Hz AC (120 pulses/second = 8333.33us per pulse)
-                    expected_interval_60hz_us = 1_000_000 / 120  # 8333.33us
-                    interval_error_pct = abs(intervals['mean_us'] - expected_interval_60hz_us) / expected_interval_60hz_us * 100
-                    self.logger.debug(f"[INTERVAL_ANALYSIS] {self.name} expected_60hz_interval={expected_interval_60hz_us:.2f}us actual_mean={intervals['mean_us']:.2f}us error={interval_error_pct:.2f}%")
+                    # Compare against the expected interval for 60Hz AC (8333.33us per pulse at 2 pulses/cycle)
+                    # Intervals are only collected when debug_enabled, so this is already debug-only
+                    interval_error_pct = abs(intervals['mean_us'] - self._expected_interval_us) / self._expected_interval_us * 100
+                    self.logger.debug("[INTERVAL_ANALYSIS] %s expected_60hz_interval=%.2fus actual_mean=%.2fus error=%.2f%%",
+                                      self.name, self._expected_interval_us, intervals['mean_us'], interval_error_pct)
             
             # Validate pulse count
             if pulse_count < 0:
                 self.consecutive_errors += 1
                 self.logger.warning(f"{self.name} invalid pulse count: {pulse_count}")
-                return (0, (count_end - sleep_start))
+                return (0, elapsed)
             
             # Warn if count is much lower than expected
             if pulse_count < expected_pulses * 0.5:
@@ -430,8 +495,7 @@ class SingleOptocoupler:
             self.consecutive_errors = 0
             self.last_successful_count = pulse_count
             
-            elapsed = count_end - sleep_start
-            self.logger.info(f"[MEASURE_END] {self.name} count={pulse_count} elapsed={elapsed:.3f}s rate={pulse_count/elapsed:.1f}/s expected_rate=120.0/s loss={pulse_loss_pct:.1f}%")
+            self.logger.info("[MEASURE_END] %s count=%d elapsed=%.3fs rate=%.1f/s expected_rate=120.0/s loss=%.1f%%", self.name, pulse_count, elapsed, pulse_count/elapsed, pulse_loss_pct)
             return (pulse_count, elapsed)
             
         except Exception as e:
@@ -454,47 +518,46 @@ class SingleOptocoupler:
         if pulse_count < 2:
             return None
         
+        # Copy all timestamps into the reusable int64 buffer (no Python list).
+        # This is the only step that can fail; the math below is plain NumPy on a valid array.
         try:
-            # Retrieve full list of timestamps
-            timestamps_ns = self.counter.get_timestamps(self.pin)
-            
-            if len(timestamps_ns) < 2:
-                return None
-            
-            # Convert timestamps to relative time in seconds (starting from 0)
-            t_first = timestamps_ns[0]
-            times_sec = np.array([(ts - t_first) / 1e9 for ts in timestamps_ns])
-            
-            # Create pulse indices (0, 1, 2, ..., n-1)
-            pulse_indices = np.arange(len(timestamps_ns))
-            
-            # Perform linear regression: time = slope * index + intercept
-            # We want to find the slope (seconds per pulse interval)
-            try:
-                slope, intercept = np.polyfit(pulse_indices, times_sec, 1)
-            except Exception as e:
-                self.logger.warning(f"{self.name} regression polyfit failed: {e}")
-                return None
-            
-            # Slope represents seconds per pulse interval
-            # Frequency = 1 / (slope * pulses_per_cycle)
-            if slope <= 0:
-                self.logger.warning(f"{self.name} invalid regression slope: {slope}")
-                return None
-            
-            frequency = 1.0 / (slope * self.pulses_per_cycle)
-            
-            # Sanity check (40-80Hz range) to prevent gross outliers
-            if 40 <= frequency <= 80:
-                self.logger.debug(f"{self.name} regression frequency: {frequency:.3f} Hz (from {len(timestamps_ns)} timestamps)")
-                return frequency
-            else:
-                self.logger.warning(f"{self.name} regression frequency {frequency:.3f} Hz out of range")
-                return None
-                
+            n, self._timestamp_buf = self.counter.get_timestamps_array(self.pin, self._timestamp_buf)
         except Exception as e:
             self.logger.warning(f"{self.name} regression calculation failed: {e}")
             return None
+        
+        # Edges keep arriving after the window closes. Timestamps are only appended, so the
+        # edges the first/last stats saw are the first stat_count; fit exactly those.
+        freq_info = self._last_freq_info
+        if freq_info is not None and freq_info[0] <= n:
+            n = freq_info[0]
+        
+        if n < 2:
+            return None
+        
+        # Convert timestamps to relative time in seconds (starting from 0)
+        ts = self._timestamp_buf[:n]
+        times_sec = (ts - ts[0]) * 1e-9
+        
+        # Least-squares fit of time = slope * index + intercept over indices x = 0..n-1.
+        # sum((x - mean_x)^2) == n(n^2 - 1)/12 and sum((x - mean_x) * y) == x.y - mean_x * sum(y),
+        # so the slope (seconds per pulse interval) needs one dot product and one sum - no polyfit needed.
+        if n > self._index_cache.size:
+            self._index_cache = np.arange(max(n, 2 * self._index_cache.size), dtype=np.float64)
+        indices = self._index_cache[:n]
+        slope = (float(np.dot(indices, times_sec)) - (n - 1) / 2 * float(times_sec.sum())) / (n * (n * n - 1) / 12)
+        
+        # Slope represents seconds per pulse interval
+        # Frequency = 1 / (slope * pulses_per_cycle); a non-positive slope fails the range check below
+        frequency = self._inv_pulses_per_cycle / slope if slope > 0 else 0.0
+        
+        # Sanity check (40-80Hz range) to prevent gross outliers
+        if not MIN_VALID_FREQUENCY <= frequency <= MAX_VALID_FREQUENCY:
+            self._warn_out_of_range('regression', "%s regression frequency %.3f Hz out of range (slope=%s)", self.name, frequency, slope)
+            return None
+        
+        self.logger.debug("%s regression frequency: %.3f Hz (from %d timestamps)", self.name, frequency, n)
+        return frequency
     
     def calculate_frequency_from_pulses(self, pulse_count: int, duration: float = None, actual_duration: float = None) -> Optional[float]:
         """
@@ -518,9 +581,9 @@ class SingleOptocoupler:
         if pulse_count <= 0 or measurement_duration <= 0:
             return None
         
-        # Calculate regression-based frequency if enabled for comparison
+        # Calculate regression-based frequency if it is the result, or if the comparison line will be logged
         freq_regression = None
-        if ENABLE_REGRESSION_COMPARISON:
+        if USE_REGRESSION_FOR_RESULT or (ENABLE_REGRESSION_COMPARISON and self.logger.isEnabledFor(logging.INFO)):
             freq_regression = self.calculate_frequency_regression(pulse_count, duration)
         
         # METHOD 1: Precise Timestamp Interval Analysis
@@ -529,12 +592,14 @@ class SingleOptocoupler:
         # Frequency = (Count - 1) / (Last_Timestamp - First_Timestamp)
         # This is the "raw" frequency of the observed pulse train without any median filtering.
         
-        # Use the stats retrieved in count_optocoupler_pulses if available
-        # (This assumes count_optocoupler_pulses was called just before this)
+        # Use the stats retrieved when the measurement finished if available, so they match pulse_count
         freq_first_last = None
         try:
-            stat_count, t_first, t_last = self.counter.get_frequency_info(self.pin)
-            self.logger.debug(f"Timestamp debug: count={stat_count}, duration_ns={t_last - t_first if stat_count > 1 else 0}")
+            freq_info = self._last_freq_info
+            if freq_info is None:
+                freq_info = self.counter.get_frequency_info(self.pin)
+            stat_count, t_first, t_last = freq_info
+            self.logger.debug("Timestamp debug: count=%d, duration_ns=%d", stat_count, t_last - t_first if stat_count > 1 else 0)
             
             if stat_count >= 2:
                 # Calculate total duration of the observed pulses
@@ -554,25 +619,35 @@ class SingleOptocoupler:
                     # 3. Our 0.2ms debounce filters out the falling edge of each pulse.
                     # 4. Therefore, we count exactly 1 rising edge per zero-crossing.
                     # Total: 2 events per AC cycle.
-                    freq_first_last = (num_intervals * 1e9) / (duration_ns * self.pulses_per_cycle)
+                    freq_first_last = num_intervals * self._freq_scale_ns / duration_ns
                     
                     # Log detailed calculation breakdown
-                    self.logger.debug(f"[FREQ_CALC_FIRST_LAST] {self.name} stat_count={stat_count} num_intervals={num_intervals} duration_ns={duration_ns} duration_sec={duration_sec:.6f} pulses_per_cycle={self.pulses_per_cycle} calculated={freq_first_last:.6f} Hz")
+                    self.logger.debug("[FREQ_CALC_FIRST_LAST] %s stat_count=%d num_intervals=%d duration_ns=%d duration_sec=%.6f pulses_per_cycle=%d calculated=%.6f Hz",
+                                      self.name, stat_count, num_intervals, duration_ns, duration_sec, self.pulses_per_cycle, freq_first_last)
                     
                     # Sanity check (40-80Hz range) to prevent gross outliers from single glitches
-                    if 40 <= freq_first_last <= 80:
-                        self.logger.debug(f"{self.name} precision frequency: {freq_first_last:.3f} Hz (from {stat_count} pulses over {duration_sec:.3f}s)")
+                    if MIN_VALID_FREQUENCY <= freq_first_last <= MAX_VALID_FREQUENCY:
+                        self.logger.debug("%s precision frequency: %.3f Hz (from %d pulses over %.3fs)", self.name, freq_first_last, stat_count, duration_sec)
                     else:
-                        self.logger.warning(f"{self.name} precision frequency {freq_first_last:.3f} Hz out of range, falling back to average")
+                        self._warn_out_of_range('first_last', "%s precision frequency %.3f Hz out of range, falling back to average", self.name, freq_first_last)
                         freq_first_last = None
         except Exception as e:
             self.logger.warning(f"{self.name} timestamp analysis failed: {e}")
         
         # Log comparison if both methods succeeded and comparison is enabled
         if ENABLE_REGRESSION_COMPARISON and freq_first_last is not None and freq_regression is not None:
-            diff = abs(freq_regression - freq_first_last)
-            diff_pct = (diff / freq_first_last) * 100 if freq_first_last > 0 else 0
-            self.logger.info(f"{self.name} frequency comparison: First/Last={freq_first_last:.6f} Hz, Regression={freq_regression:.6f} Hz, Diff={diff:.6f} Hz ({diff_pct:.3f}%)")
+            diff_pct = abs(freq_regression - freq_first_last) / freq_first_last * 100 if freq_first_last > 0 else 0.0
+            self._comp_log_count += 1
+            self._comp_diff_pct_sum += diff_pct
+            if diff_pct > self._comp_diff_pct_max:
+                self._comp_diff_pct_max = diff_pct
+            if self._comp_log_count >= REGRESSION_COMPARISON_LOG_INTERVAL:
+                self.logger.info("%s frequency comparison over %d measurements: mean diff=%.4f%%, max diff=%.4f%% (last First/Last=%.6f Hz, Regression=%.6f Hz)",
+                                 self.name, self._comp_log_count, self._comp_diff_pct_sum / self._comp_log_count,
+                                 self._comp_diff_pct_max, freq_first_last, freq_regression)
+                self._comp_log_count = 0
+                self._comp_diff_pct_sum = 0.0
+                self._comp_diff_pct_max = 0.0
         
         # Use regression result if enabled and available, otherwise use first/last
         if USE_REGRESSION_FOR_RESULT and freq_regression is not None:
@@ -589,36 +664,49 @@ class SingleOptocoupler:
         # So we divide by 4 to convert edge count to frequency
         # UPDATE: With 0.2ms debounce, we filter the falling edge (pulse width ~33us).
         # So we count 2 edges per cycle.
-        frequency = pulse_count / (measurement_duration * self.pulses_per_cycle)  # 2 edges per AC cycle (Debounced)
+        frequency = pulse_count * self._inv_pulses_per_cycle / measurement_duration  # 2 edges per AC cycle (Debounced)
         
         # Log detailed calculation breakdown
-        divisor = measurement_duration * self.pulses_per_cycle
-        self.logger.debug(f"[FREQ_CALC_AVERAGE] {self.name} pulse_count={pulse_count} measurement_duration={measurement_duration:.6f} pulses_per_cycle={self.pulses_per_cycle} divisor={divisor:.6f} calculated={frequency:.6f} Hz")
+        self.logger.debug("[FREQ_CALC_AVERAGE] %s pulse_count=%d measurement_duration=%.6f pulses_per_cycle=%d divisor=%.6f calculated=%.6f Hz",
+                          self.name, pulse_count, measurement_duration, self.pulses_per_cycle,
+                          measurement_duration * self.pulses_per_cycle, frequency)
         
         if actual_duration is not None and abs(actual_duration - duration) > 0.001:
-            self.logger.debug(f"{self.name} calculated frequency: {frequency:.3f} Hz from {pulse_count} pulses in {actual_duration:.3f}s (requested: {duration:.3f}s)")
+            self.logger.debug("%s calculated frequency: %.3f Hz from %d pulses in %.3fs (requested: %.3fs)",
+                              self.name, frequency, pulse_count, actual_duration, duration)
         else:
-            self.logger.debug(f"{self.name} calculated frequency: {frequency:.3f} Hz from {pulse_count} pulses in {measurement_duration:.2f}s")
+            self.logger.debug("%s calculated frequency: %.3f Hz from %d pulses in %.2fs",
+                              self.name, frequency, pulse_count, measurement_duration)
         return frequency
     
+    def _warn_out_of_range(self, kind: str, msg: str, *args):
+        """Log an out-of-range frequency warning, at most once per OUT_OF_RANGE_WARN_INTERVAL for each kind."""
+        now_ns = _now_ns()
+        if now_ns >= self._next_range_warn_ns[kind]:
+            self._next_range_warn_ns[kind] = now_ns + int(OUT_OF_RANGE_WARN_INTERVAL * 1e9)
+            self.logger.warning(msg, *args)
+    
     def check_health(self) -> bool:
         """Check optocoupler health and attempt recovery if needed."""
-        current_time = time.time()
+        now_ns = _now_ns()
         
         # Only check health periodically
-        if current_time - self.last_health_check < self.health_check_interval:
+        if now_ns < self._next_health_check_ns:
             return True
-        
-        self.last_health_check = current_time
+        return self._do_health_check(now_ns)
+    
+    def _do_health_check(self, now_ns: int) -> bool:
+        """Run the health check that is due at _now_ns() time 'now_ns'."""
+        self._next_health_check_ns = now_ns + self.health_check_interval_ns
         
         try:
             # Perform a quick test read
-            test_count = self.counter.get_count(self.pin)
+            test_count = self._get_count(self.pin)
             
             # Check if counter is responding
             if test_count >= 0:  # Valid count
                 self.consecutive_errors = 0
-                self.logger.debug(f"{self.name} health check passed: count={test_count}")
+                self.logger.debug("%s health check passed: count=%d", self.name, test_count)
                 return True
             else:
                 self.consecutive_errors += 1
@@ -645,7 +733,8 @@ class SingleOptocoupler:
         
         try:
             # Reset counter
-            self.counter.reset_count(self.pin)
+            self._reset_count(self.pin)
+            self._last_freq_info = None
             
             # Re-setup optocoupler
             self._setup_optocoupler()
@@ -675,6 +764,7 @@ class SingleOptocoupler:
     
     def cleanup(self):
         """Cleanup optocoupler resources."""
+        self._stop_event.set()
         if self.gpio_available and self.initialized:
             try:
                 # Cleanup libgpiod counter
@@ -688,6 +778,12 @@ class SingleOptocoupler:
 class OptocouplerManager:
     """Manages one or more optocouplers for frequency measurement with graceful degradation."""
     
+    __slots__ = (
+        'config', 'logger', 'gpio_available', 'optocoupler_enabled', 'optocouplers',
+        'optocoupler_initialized', 'inverter_mapping',
+        '_all_inverters_cache', '_enabled_inverters_cache',
+    )
+    
     def __init__(self, config, logger: logging.Logger):
         self.config = config
         self.logger = logger
@@ -704,10 +800,9 @@ class OptocouplerManager:
         # Initialize optocouplers
         self.optocouplers = {}
         self.optocoupler_initialized = False
-        self.cpu_affinity_set = False
-        
-        # Thread priority optimization
-        self._setup_thread_priority()
+        self.inverter_mapping = {}
+        self._all_inverters_cache = ()
+        self._enabled_inverters_cache = ()
         
         if self.optocoupler_enabled:
             self._setup_optocouplers()
@@ -729,6 +824,9 @@ class OptocouplerManager:
             
         try:
             optocoupler_config = self.config['hardware']['optocoupler']
+            max_consecutive_errors = optocoupler_config['max_consecutive_errors']
+            health_check_interval = optocoupler_config['health_check_interval']
+            max_recovery_attempts = optocoupler_config['max_recovery_attempts']
             
             # Always setup primary optocoupler
             primary_config = optocoupler_config['primary']
@@ -741,7 +839,10 @@ class OptocouplerManager:
         
         self.optocouplers['primary'] = SingleOptocoupler(
             self.config, self.logger, primary_name, primary_pin, 
-            primary_pulses, primary_duration
+            primary_pulses, primary_duration,
+            max_consecutive_errors=max_consecutive_errors,
+            health_check_interval=health_check_interval,
+            max_recovery_attempts=max_recovery_attempts
         )
         self.logger.info(f"Optocoupler configured on pin {primary_pin}")
         
@@ -772,100 +873,72 @@ class OptocouplerManager:
                 }]
                 self.logger.info("Converted legacy single inverter config to new multi-inverter format")
             
-            self.inverter_mapping['primary'] = []
-            if primary_inverters:
-                for inverter in primary_inverters:
-                    if inverter.get('id') and inverter.get('enabled', True):
-                        self.inverter_mapping['primary'].append({
-                            'id': inverter['id'],
-                            'name': inverter.get('name', f"Inverter {inverter['id']}"),
-                            'enabled': inverter.get('enabled', True)
-                        })
-                        self.logger.info(f"Optocoupler mapped to inverter: {inverter['id']} ({inverter.get('name', 'Unnamed')})")
+            # Entries are read-only so the tuples can be shared with callers as-is
+            self.inverter_mapping['primary'] = tuple(
+                MappingProxyType({
+                    'id': inverter['id'],
+                    'name': inverter.get('name', f"Inverter {inverter['id']}"),
+                    'enabled': inverter.get('enabled', True)
+                })
+                for inverter in primary_inverters or ()
+                if inverter.get('id') and inverter.get('enabled', True)
+            )
+            for inverter in self.inverter_mapping['primary']:
+                self.logger.info(f"Optocoupler mapped to inverter: {inverter['id']} ({inverter['name']})")
                 
         except KeyError as e:
             self.logger.warning(f"Missing inverter configuration: {e}")
-            self.inverter_mapping = {'primary': []}
+            self.inverter_mapping = {'primary': ()}
+        
+        self._cache_inverter_views()
+    
+    def _cache_inverter_views(self):
+        """Precompute the read-only inverter lists returned by the getters below.
+        
+        The mapping only changes when _build_inverter_mapping runs, so the getters
+        hand out these shared tuples instead of copying dicts on every call.
+        """
+        self._all_inverters_cache = tuple(
+            MappingProxyType({**inverter, 'optocoupler': name})
+            for name, inverters in self.inverter_mapping.items()
+            for inverter in inverters
+        )
+        self._enabled_inverters_cache = tuple(
+            inv for inv in self._all_inverters_cache if inv.get('enabled', True)
+        )
     
-    def get_inverters_for_optocoupler(self, optocoupler_name: str) -> List[dict]:
+    def get_inverters_for_optocoupler(self, optocoupler_name: str) -> Tuple[Mapping[str, Any], ...]:
         """
-        Get list of inverters associated with a specific optocoupler.
+        Get inverters associated with a specific optocoupler.
         
         Args:
             optocoupler_name: 'primary' (only primary is supported)
             
         Returns:
-            List of inverter dictionaries with 'id', 'name', and 'enabled' keys
+            Tuple of read-only inverter mappings with 'id', 'name', and 'enabled' keys
         """
         if optocoupler_name != 'primary':
             self.logger.warning(f"Only 'primary' optocoupler is supported, got '{optocoupler_name}'")
-            return []
-        return self.inverter_mapping.get(optocoupler_name, [])
+            return ()
+        return self.inverter_mapping.get(optocoupler_name, ())
     
-    def get_all_inverters(self) -> List[dict]:
+    def get_all_inverters(self) -> Tuple[Mapping[str, Any], ...]:
         """
         Get all inverters from all optocouplers.
         
         Returns:
-            List of all inverter dictionaries with optocoupler context
+            Tuple of read-only inverter mappings with optocoupler context
         """
-        all_inverters = []
-        
-        for optocoupler_name, inverters in self.inverter_mapping.items():
-            for inverter in inverters:
-                inverter_with_context = inverter.copy()
-                inverter_with_context['optocoupler'] = optocoupler_name
-                all_inverters.append(inverter_with_context)
-        
-        return all_inverters
+        return self._all_inverters_cache
     
-    def get_enabled_inverters(self) -> List[dict]:
+    def get_enabled_inverters(self) -> Tuple[Mapping[str, Any], ...]:
         """
         Get all enabled inverters from all optocouplers.
         
         Returns:
-            List of enabled inverter dictionaries with optocoupler context
+            Tuple of read-only enabled inverter mappings with optocoupler context
         """
-        return [inv for inv in self.get_all_inverters() if inv.get('enabled', True)]
-    
-    def _setup_thread_priority(self):
-        """Setup high-priority threading and CPU affinity for optocoupler measurements."""
-        try:
-            # Set current process to high priority (safe for RPi 4)
-            current_process = psutil.Process()
-            
-            # Set process priority to high (but not realtime to avoid system issues)
-            if hasattr(psutil, 'HIGH_PRIORITY_CLASS'):
-                current_process.nice(psutil.HIGH_PRIORITY_CLASS)
-                self.logger.info("Set process priority to HIGH")
-            else:
-                # On Linux, use nice value (-10 to 19, lower = higher priority)
-                # Use -5 for high priority (safe for RPi 4)
-                os.nice(-5)
-                self.logger.info("Set process nice value to -5 (high priority)")
-            
-            # Set CPU affinity to single core for consistent timing (RPi4 optimization)
-            if not self.cpu_affinity_set:
-                try:
-                    # Pin to CPU core 3 (last core) to avoid interference with system processes
-                    current_process.cpu_affinity([3])
-                    self.cpu_affinity_set = True
-                    self.logger.info("Set CPU affinity to core 3 for consistent timing")
-                except (OSError, ValueError) as e:
-                    self.logger.warning(f"Could not set CPU affinity: {e}")
-                    # Try core 2 as fallback
-                    try:
-                        current_process.cpu_affinity([2])
-                        self.cpu_affinity_set = True
-                        self.logger.info("Set CPU affinity to core 2 for consistent timing")
-                    except (OSError, ValueError):
-                        self.logger.warning("Could not set CPU affinity, continuing with default")
-                
-        except (PermissionError, OSError) as e:
-            self.logger.warning(f"Could not set high priority: {e}")
-            self.logger.info("Continuing with normal priority")
-        except Exception as e:
-            self.logger.warning(f"Thread priority setup failed: {e}")
+        return self._enabled_inverters_cache
     
     def start_measurement(self, duration: float = None, optocoupler_name: str = 'primary') -> bool:
         """
@@ -972,24 +1045,22 @@ class OptocouplerManager:
     
     def check_all_health(self) -> Dict[str, bool]:
         """Check health of all optocouplers."""
-        health_status = {}
-        for name, optocoupler in self.optocouplers.items():
-            health_status[name] = optocoupler.check_health()
-        return health_status
+        return {name: optocoupler.check_health() for name, optocoupler in self.optocouplers.items()}
     
     def get_health_status(self) -> Dict[str, Any]:
         """Get detailed health status of all optocouplers."""
-        status = {}
-        for name, optocoupler in self.optocouplers.items():
-            status[name] = {
-                'healthy': optocoupler.is_healthy(),
+        return {
+            name: {
+                # Same test as is_healthy(), inlined to avoid a method call per optocoupler
+                'healthy': optocoupler.consecutive_errors < optocoupler.max_consecutive_errors and optocoupler.initialized,
                 'initialized': optocoupler.initialized,
                 'consecutive_errors': optocoupler.consecutive_errors,
                 'max_consecutive_errors': optocoupler.max_consecutive_errors,
                 'recovery_attempts': optocoupler.recovery_attempts,
                 'last_successful_count': optocoupler.last_successful_count
             }
-        return status
+            for name, optocoupler in self.optocouplers.items()
+        }
     
     def cleanup(self):
         """Cleanup optocoupler resources."""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Fixed-size NumPy ring buffer for the monitor's sample history.
+Stores values in one preallocated array so analysis code can read the
+history as an ndarray without converting a deque of Python floats.
+Running sums give the mean and standard deviation in O(1) per sample.
+The backing array is rounded up to a power of two so indices wrap with a
+bit mask instead of a modulo, and every value is mirrored into a second
+copy of the array so the history is always one contiguous slice.
+"""
+
+import numpy as np
+
+
+class NDRingBuffer:
+    """Preallocated circular buffer of numbers, oldest sample first on read."""
+
+    def __init__(self, maxlen: int, dtype=np.float64):
+        if maxlen <= 0:
+            raise ValueError(f"Ring buffer size must be positive, got {maxlen}")
+        capacity = 1 << (maxlen - 1).bit_length()  # Next power of two >= maxlen
+        # Two back-to-back copies: buf[i] == buf[i + capacity], so any run of up to
+        # capacity samples starting in the first half is contiguous
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._maxlen = maxlen
+        self._head = 0  # Next write position
+        self._filled = 0
+        # Running sums of (value - shift); shifting by the first sample keeps
+        # the sum of squares well conditioned for values like 60.0 +/- 0.01
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def __iter__(self):
+        return iter(self.as_ndarray_view().tolist())
+
+    def append(self, value: float):
+        """Add a value, overwriting the oldest one when full."""
+        if self._filled == 0:
+            self._shift = float(value)
+        head = self._head
+        if self._filled == self._maxlen:
+            old = float(self._buf[(head - self._maxlen) & self._mask]) - self._shift
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._buf[head] = value
+        self._buf[head + self._capacity] = value
+        new = float(self._buf[head]) - self._shift
+        self._sum += new
+        self._sum_sq += new * new
+        self._head = (head + 1) & self._mask
+        if self._filled < self._maxlen:
+            self._filled += 1
+        elif self._head == 0:
+            # Recompute the sums once per lap so rounding error can't accumulate
+            shifted = self.as_ndarray_view().astype(np.float64) - self._shift
+            self._sum = float(shifted.sum())
+            self._sum_sq = float(np.dot(shifted, shifted))
+
+    def clear(self):
+        self._head = 0
+        self._filled = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def mean(self) -> float:
+        """Mean of the stored values (NaN when empty)."""
+        if self._filled == 0:
+            return float('nan')
+        return self._shift + self._sum / self._filled
+
+    def std(self) -> float:
+        """Population standard deviation of the stored values (NaN when empty)."""
+        if self._filled == 0:
+            return float('nan')
+        mean_shifted = self._sum / self._filled
+        variance = self._sum_sq / self._filled - mean_shifted * mean_shifted
+        return variance ** 0.5 if variance > 0.0 else 0.0
+
+    def as_ndarray_view(self) -> np.ndarray:
+        """
+        Return the stored values in chronological order.
+
+        Always a zero-copy, C-contiguous view on the backing array (no allocation).
+        It is only valid until the next append; callers must not modify it.
+        """
+        start = (self._head - self._filled) & self._mask
+        return self._buf[start:start + self._filled]
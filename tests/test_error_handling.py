@@ -4,6 +4,7 @@ Tests for error handling and edge cases across the monitoring system.
 """
 
 import pytest
+import os
 import numpy as np
 import logging
 from unittest.mock import Mock, patch, MagicMock
@@ -74,19 +75,16 @@ class TestFrequencyAnalyzerErrorHandling:
         result = analyzer.classify_power_source(None, None, None)
         assert result == "Unknown"
 
-    def test_classify_power_source_invalid_thresholds(self, config, logger):
-        """Test classify_power_source handles invalid threshold config."""
-        analyzer = FrequencyAnalyzer(config, logger)
-
-        # Mock invalid thresholds
-        analyzer.thresholds = {
+    def test_invalid_thresholds_rejected_at_startup(self, config, logger):
+        """Test non-numeric threshold config is rejected when the analyzer is created."""
+        config['analysis']['generator_thresholds'] = {
             'allan_variance': 'invalid',
             'std_dev': 'also_invalid',
             'kurtosis': 'not_a_number'
         }
 
-        result = analyzer.classify_power_source(1e-9, 0.05, 0.3)
-        assert result == "Unknown"  # Should fall back due to threshold conversion failure
+        with pytest.raises(ValueError):
+            FrequencyAnalyzer(config, logger)
 
     def test_count_zero_crossings_hardware_failure(self, config, logger):
         """Test count_zero_crossings handles hardware failures."""
@@ -15,7 +15,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
-from monitor import FrequencyAnalyzer
+import allantools
+from monitor import FrequencyAnalyzer, _adev_at_tau
 
 
 @pytest.fixture
@@ -191,6 +192,20 @@ def test_frequency_analyzer_stability_analysis(analyzer):
     assert std_freq >= 0, "Standard deviation should be non-negative"
 
 
+@pytest.mark.parametrize("sample_count", [6, 10, 15, 31, 64])
+@pytest.mark.parametrize("tau_target", [2.0, 10.0, 30.0])
+def test_adev_at_tau_matches_allantools(sample_count, tau_target):
+    """Direct single-tau Allan deviation matches the nearest tau from allantools.adev."""
+    rng = np.random.default_rng(sample_count)
+    frac_freq = rng.normal(0, 0.3, sample_count) / 60.0
+    rate = 0.5  # 2 second measurements
+
+    taus_out, adev, _, _ = allantools.adev(frac_freq, rate=rate, data_type='freq')
+    expected = float(adev[np.argmin(np.abs(taus_out - tau_target))])
+
+    assert _adev_at_tau(frac_freq, rate, tau_target) == pytest.approx(expected, rel=1e-12)
+
+
 def test_frequency_analyzer_classification(analyzer):
     """Test power source classification with various metrics."""
     test_cases = [
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from monitor import FrequencyMonitor, PowerState
 from config import Config
+from ring_buffer import NDRingBuffer
 
 
 @pytest.fixture
@@ -97,8 +98,8 @@ def test_frequency_monitor_initialization(mock_offline, mock_restart, mock_tunin
     # Verify data buffers were initialized
     assert hasattr(monitor, 'freq_buffer')
     assert hasattr(monitor, 'time_buffer')
-    assert isinstance(monitor.freq_buffer, deque)
-    assert isinstance(monitor.time_buffer, deque)
+    assert isinstance(monitor.freq_buffer, NDRingBuffer)
+    assert isinstance(monitor.time_buffer, NDRingBuffer)
 
     # Verify state variables
     assert monitor.running == True
@@ -10,6 +10,8 @@ import logging
 import threading
 from typing import List
 
+import numpy as np
+
 from tests.test_utils_gpio import (
     setup_mock_gpiod, inject_pulses, verify_frequency, analyze_pulse_data,
     create_test_counter, run_pulse_analysis
@@ -18,6 +20,7 @@ from tests.pulse_patterns import (
     generate_stable_60hz, generate_generator_hunting, generate_noisy_signal,
     generate_with_gaps, generate_zero_voltage, generate_high_frequency_burst
 )
+from tests.mock_gpiod import MockEdgeEvent
 from gpio_event_counter import GPIOEventCounter
 
 
@@ -77,6 +80,36 @@ class TestBasicFunctionality:
         assert count > 0
         assert count == len(timestamps)  # Should match injected pulses
     
+    def test_batched_events_all_counted(self, counter_and_chip, monkeypatch):
+        """Test every edge returned by one read_edge_events() call is counted, not just the last."""
+        counter, mock_chip = counter_and_chip
+        pin = 26
+        
+        counter.register_pin(pin)
+        counter.reset_count(pin)
+        
+        timestamps = generate_stable_60hz(duration=0.5, pulses_per_cycle=2)
+        pending = [[MockEdgeEvent(line_offset=pin, timestamp_ns=ts, event_type="rising") for ts in timestamps]]
+        
+        def wait_edge_events(timeout=0.5):
+            if pending:
+                return True
+            time.sleep(0.01)
+            return False
+        
+        # Deliver all the edges as a single batch
+        monkeypatch.setattr(counter._request, 'wait_edge_events', wait_edge_events)
+        monkeypatch.setattr(counter._request, 'read_edge_events', lambda: pending.pop() if pending else [])
+        
+        deadline = time.time() + 2.0
+        while pending and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        
+        assert len(timestamps) > 1
+        assert counter.get_count(pin) == len(timestamps)
+        assert len(counter.get_timestamps(pin)) == len(timestamps)
+    
     def test_timestamp_collection(self, counter_and_chip):
         """Test timestamp collection."""
         counter, mock_chip = counter_and_chip
@@ -95,6 +128,67 @@ class TestBasicFunctionality:
         assert len(collected_timestamps) > 0
         assert len(collected_timestamps) == len(timestamps)
     
+    def test_timestamps_array(self, counter_and_chip):
+        """Test timestamps copied into a caller-owned int64 buffer."""
+        counter, mock_chip = counter_and_chip
+        pin = 26
+        
+        counter.register_pin(pin)
+        counter.reset_count(pin)
+        
+        timestamps = generate_stable_60hz(duration=0.5, pulses_per_cycle=2)
+        inject_pulses(mock_chip, pin, timestamps)
+        time.sleep(0.3)
+        
+        # A large enough buffer is filled in place
+        buf = np.zeros(len(timestamps) + 10, dtype=np.int64)
+        count, out = counter.get_timestamps_array(pin, buf)
+        assert out is buf
+        assert count == len(timestamps)
+        assert out[:count].tolist() == counter.get_timestamps(pin)
+        
+        # A too-small buffer is replaced with a new one
+        count, out = counter.get_timestamps_array(pin, np.zeros(1, dtype=np.int64))
+        assert count == len(timestamps)
+        assert out.dtype == np.int64
+        assert out[:count].tolist() == counter.get_timestamps(pin)
+    
+    def test_snapshot(self, counter_and_chip):
+        """Test snapshot returns count, frequency info and event statistics from one read."""
+        counter, mock_chip = counter_and_chip
+        pin = 26
+        
+        # Interval statistics are only collected while the counter logs at DEBUG
+        previous_level = counter.logger.level
+        counter.logger.setLevel(logging.DEBUG)
+        try:
+            counter.register_pin(pin)
+            counter.reset_count(pin)
+            
+            timestamps = generate_stable_60hz(duration=0.5, pulses_per_cycle=2)
+            inject_pulses(mock_chip, pin, timestamps)
+            time.sleep(0.3)
+        finally:
+            counter.logger.setLevel(previous_level)
+        
+        count, stat_count, t_first, t_last, stats = counter.snapshot(pin)
+        assert count == len(timestamps)
+        assert stat_count == len(timestamps)
+        assert t_first == timestamps[0]
+        assert t_last == timestamps[-1]
+        assert stats['count'] == count
+        assert stats['timestamp_count'] == stat_count
+        assert stats['accepted'] == len(timestamps)
+        assert stats['intervals'] is None
+        
+        *_, stats = counter.snapshot(pin, include_intervals=True)
+        assert stats['intervals'] is not None
+        assert stats['intervals']['count'] == len(timestamps) - 1
+        assert stats == counter.get_event_statistics(pin, include_intervals=True)
+        
+        # Unregistered pins read as empty, with no statistics
+        assert counter.snapshot(27) == (0, 0, 0, 0, None)
+    
     def test_count_reset(self, counter_and_chip):
         """Test count reset functionality."""
         counter, mock_chip = counter_and_chip
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for OfflineAnalyzer - analysis of detailed frequency log files.
+"""
+
+import csv
+import logging
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from offline_analyzer import OfflineAnalyzer, _percentile_95_and_max
+from config import Config
+
+
+HEADER = [
+    'timestamp', 'datetime', 'unix_timestamp', 'elapsed_seconds',
+    'frequency_hz', 'allan_variance', 'std_deviation', 'kurtosis',
+    'power_source', 'confidence', 'sample_count', 'buffer_size'
+]
+
+
+def _row(i, freq, avar='N/A', std='N/A', source='Utility Grid'):
+    return [f"2025-01-01 00:00:{i:02d}", f"2025-01-01T00:00:{i:02d}", f"{1735689600 + i}", f"{i}",
+            f"{freq}", avar, std, 'N/A', source, '0.9', f"{i + 1}", '300']
+
+
+@pytest.fixture
+def config():
+    """Create a config instance for testing."""
+    return Config("config.yaml")
+
+
+@pytest.fixture
+def logger():
+    """Create a logger for testing."""
+    logger = logging.getLogger('test_offline_analyzer')
+    logger.setLevel(logging.WARNING)
+    return logger
+
+
+@pytest.fixture
+def analyzer(config, logger):
+    return OfflineAnalyzer(config, logger)
+
+
+@pytest.fixture
+def detailed_log(tmp_path):
+    """Write a small detailed log with a mix of missing and measured metrics."""
+    path = tmp_path / "detailed.csv"
+    rows = [
+        _row(0, 60.0),
+        _row(1, 60.1, avar='1e-10', std='0.01'),
+        _row(2, 59.9, avar='4e-09', std='0.2', source='Generac Generator'),
+        _row(3, 60.0, avar='2e-10', std='0.02', source='Unknown'),
+    ]
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_read_detailed_log_returns_typed_columns(analyzer, detailed_log):
+    """Each column comes back as one typed array; 'N/A' metrics become NaN."""
+    data = analyzer._read_detailed_log_file(detailed_log)
+    assert set(data) == set(HEADER)
+    assert data['frequency_hz'].dtype == np.float64
+    assert data['frequency_hz'].tolist() == [60.0, 60.1, 59.9, 60.0]
+    assert data['sample_count'].dtype == np.int64
+    assert data['power_source'].tolist() == ['Utility Grid', 'Utility Grid', 'Generac Generator', 'Unknown']
+    assert np.isnan(data['allan_variance'][0])
+    assert data['allan_variance'][1] == pytest.approx(1e-10)
+
+
+def test_read_detailed_log_skips_invalid_rows(analyzer, detailed_log):
+    """A malformed row is dropped without losing the valid ones."""
+    with open(detailed_log, 'a', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(_row(4, 'garbage'))
+        writer.writerow(['too', 'short'])
+    data = analyzer._read_detailed_log_file(detailed_log)
+    assert len(data['frequency_hz']) == 4
+
+
+def test_read_detailed_log_missing_file(analyzer, tmp_path):
+    assert analyzer._read_detailed_log_file(str(tmp_path / "missing.csv")) == {}
+
+
+def test_offline_analysis_statistics(analyzer, detailed_log):
+    """Summary statistics ignore missing metrics and count each classification."""
+    results = analyzer._perform_offline_analysis(analyzer._read_detailed_log_file(detailed_log))
+
+    freq_stats = results['frequency_statistics']
+    assert freq_stats['count'] == 4
+    assert freq_stats['mean'] == pytest.approx(60.0)
+    assert freq_stats['range'] == pytest.approx(0.2)
+
+    class_stats = results['classification_statistics']
+    assert class_stats['utility_count'] == 2
+    assert class_stats['generator_count'] == 1
+    assert class_stats['unknown_count'] == 1
+
+    metrics = results['analysis_metrics']
+    assert metrics['max_std_deviation'] == pytest.approx(0.2)
+    assert metrics['mean_kurtosis'] == 0
+
+    recommended = results['recommended_thresholds']
+    assert recommended['recommended_std_deviation'] == pytest.approx(np.percentile([0.01, 0.2, 0.02], 95))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 20, 101, 1000])
+def test_percentile_95_and_max_match_numpy(size):
+    """The partition-based percentile interpolates exactly like np.percentile."""
+    values = np.random.default_rng(size).random(size)
+    p95, maximum = _percentile_95_and_max(values)
+    assert p95 == pytest.approx(np.percentile(values, 95), rel=1e-12)
+    assert maximum == np.max(values)
+
+
+def test_analyze_offline_data_writes_report(analyzer, detailed_log, tmp_path):
+    """The report has the summary sections followed by the raw rows."""
+    output = tmp_path / "report.csv"
+    analyzer.analyze_offline_data(detailed_log, str(output))
+
+    with open(output, newline='') as f:
+        rows = list(csv.reader(f))
+    assert ['FREQUENCY STATISTICS', '', ''] in rows
+    raw_start = rows.index(['RAW DATA', '', ''])
+    assert rows[raw_start + 1] == [''] + HEADER
+    raw_rows = rows[raw_start + 2:]
+    assert len(raw_rows) == 4
+    # Missing metrics are written back as blanks
+    assert raw_rows[0][HEADER.index('allan_variance') + 1] == ''
+
+
+def test_read_detailed_log_in_chunks(analyzer, detailed_log, monkeypatch):
+    """Reading in several chunks gives the same columns as one pass."""
+    expected = analyzer._read_detailed_log_file(detailed_log)
+    monkeypatch.setattr('offline_analyzer.READ_CHUNK_ROWS', 3)
+    with open(detailed_log, 'a', newline='') as f:
+        csv.writer(f).writerow(_row(4, 'garbage'))
+    data = analyzer._read_detailed_log_file(detailed_log)
+    assert list(data) == list(expected)
+    for name in expected:
+        np.testing.assert_array_equal(data[name], expected[name])
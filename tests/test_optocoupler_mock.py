@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tests for SingleOptocoupler measurement and frequency logic using a fake counter.
+Runs without hardware or the libgpiod event thread.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optocoupler
+from config import Config
+from optocoupler import SingleOptocoupler
+
+
+PIN = 26
+START_NS = 1_000_000_000
+
+
+def _edges(freq_hz, count, start_ns=START_NS, pulses_per_cycle=2):
+    """Evenly spaced edge timestamps (ns) for an AC signal at freq_hz."""
+    return [start_ns + round(i * 1e9 / (freq_hz * pulses_per_cycle)) for i in range(count)]
+
+
+def _polyfit_frequency(timestamps, pulses_per_cycle=2):
+    """Reference frequency from np.polyfit, as the regression was originally computed."""
+    times_sec = (np.asarray(timestamps, dtype=np.int64) - timestamps[0]) / 1e9
+    slope = np.polyfit(np.arange(len(timestamps)), times_sec, 1)[0]
+    return 1.0 / (slope * pulses_per_cycle)
+
+
+class FakeCounter:
+    """Stand-in for GPIOEventCounter that serves a list of edge timestamps set by the test."""
+
+    def __init__(self, logger=None):
+        self.timestamps = []
+
+    def register_pin(self, pin):
+        return True
+
+    def get_count(self, pin):
+        return len(self.timestamps)
+
+    def reset_count(self, pin):
+        self.timestamps = []
+        return True
+
+    def get_frequency_info(self, pin):
+        ts = self.timestamps
+        return (len(ts), ts[0], ts[-1]) if ts else (0, 0, 0)
+
+    def get_timestamps_array(self, pin, out=None):
+        count = len(self.timestamps)
+        if out is None or out.size < count:
+            out = np.empty(count, dtype=np.int64)
+        out[:count] = self.timestamps
+        return (count, out)
+
+    def snapshot(self, pin, include_intervals=False):
+        count, first, last = self.get_frequency_info(pin)
+        return (len(self.timestamps), count, first, last, None)
+
+    def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def config():
+    """Create a config instance for testing."""
+    return Config("config.yaml")
+
+
+@pytest.fixture
+def logger():
+    """Create a logger for testing."""
+    logger = logging.getLogger('test_optocoupler_mock')
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+@pytest.fixture
+def opto(config, logger, monkeypatch):
+    """SingleOptocoupler wired to a FakeCounter (reachable as opto.counter)."""
+    monkeypatch.setattr(optocoupler, 'GPIO_AVAILABLE', True)
+    monkeypatch.setattr(optocoupler, 'create_counter', FakeCounter)
+    sensor = SingleOptocoupler(config, logger, 'primary', PIN, pulses_per_cycle=2, measurement_duration=2.0)
+    assert sensor.initialized
+    yield sensor
+    sensor.cleanup()
+
+
+def _finish_window(opto, timestamps, duration=0.01):
+    """Run a short non-blocking measurement that closes with the given edges recorded."""
+    assert opto.start_measurement(duration)
+    opto.counter.timestamps = list(timestamps)
+    time.sleep(duration + 0.01)
+    complete, pulse_count, _ = opto.check_measurement()
+    assert complete
+    return pulse_count
+
+
+def test_regression_uses_the_edges_of_the_closed_window(opto):
+    """Edges arriving after the window closes don't reach the regression or the first/last result."""
+    window = _edges(60.0, 240)
+    pulse_count = _finish_window(opto, window)
+    assert opto._last_freq_info == (240, window[0], window[-1])
+
+    # Late edges at a different rate, recorded before the frequency is calculated
+    opto.counter.timestamps.extend(_edges(50.0, 50, start_ns=window[-1] + 10_000_000))
+
+    freq_regression = opto.calculate_frequency_regression(pulse_count)
+    freq_first_last = opto.calculate_frequency_from_pulses(pulse_count, 2.0)
+    assert freq_regression == pytest.approx(_polyfit_frequency(window), rel=1e-9)
+    assert freq_regression == pytest.approx(60.0, rel=1e-6)
+    assert freq_first_last == pytest.approx(60.0, rel=1e-6)
+
+
+def test_regression_matches_polyfit(opto):
+    """The closed-form slope gives the same frequency as a degree-1 np.polyfit."""
+    rng = np.random.default_rng(0)
+    jitter = rng.normal(0, 20_000, 240).astype(np.int64)  # ~20us of edge jitter
+    timestamps = (np.asarray(_edges(59.97, 240)) + jitter).tolist()
+    opto.counter.timestamps = timestamps
+
+    freq = opto.calculate_frequency_regression(len(timestamps))
+    assert freq == pytest.approx(_polyfit_frequency(timestamps), rel=1e-9)
+    assert freq == pytest.approx(59.97, abs=0.01)
+
+
+@pytest.mark.parametrize("pulse_count, edge_count", [(0, 0), (1, 1), (5, 1), (1, 240)])
+def test_regression_needs_two_edges(opto, pulse_count, edge_count):
+    """Fewer than two pulses or timestamps gives no regression result."""
+    opto.counter.timestamps = _edges(60.0, edge_count)
+    assert opto.calculate_frequency_regression(pulse_count) is None
+
+
+@pytest.mark.parametrize("timestamps", [
+    _edges(90.0, 240),          # Above the valid range
+    _edges(30.0, 240),          # Below the valid range
+    [START_NS] * 240,           # Zero slope
+    _edges(60.0, 240)[::-1],    # Negative slope
+])
+def test_regression_rejects_out_of_range(opto, timestamps):
+    """Frequencies outside 40-80 Hz, and non-positive slopes, are rejected."""
+    opto.counter.timestamps = timestamps
+    assert opto.calculate_frequency_regression(len(timestamps)) is None
+
+
+def test_out_of_range_warnings_rate_limited_per_kind(opto, monkeypatch, caplog):
+    """Each kind of out-of-range warning is logged at most once per interval, independently."""
+    now = [10 * 10**9]
+    monkeypatch.setattr(optocoupler, '_now_ns', lambda: now[0])
+    interval_ns = int(optocoupler.OUT_OF_RANGE_WARN_INTERVAL * 1e9)
+
+    def warnings():
+        return [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+
+    with caplog.at_level(logging.WARNING):
+        opto._warn_out_of_range('regression', "regression %d", 1)
+        now[0] += interval_ns // 2
+        opto._warn_out_of_range('regression', "regression %d", 2)
+        assert warnings() == ["regression 1"]
+
+        # The other kind isn't suppressed by the first
+        opto._warn_out_of_range('first_last', "first_last %d", 1)
+        assert warnings() == ["regression 1", "first_last 1"]
+
+        # Once the interval has passed since the first warning, it is logged again
+        now[0] += interval_ns // 2
+        opto._warn_out_of_range('regression', "regression %d", 3)
+        assert warnings() == ["regression 1", "first_last 1", "regression 3"]
+
+
+def test_comparison_summary_logged_once_per_interval(opto, caplog):
+    """The regression vs first/last comparison is summarised at INFO once per interval, then reset."""
+    interval = optocoupler.REGRESSION_COMPARISON_LOG_INTERVAL
+    rng = np.random.default_rng(1)
+
+    def summaries():
+        return [r for r in caplog.records if "frequency comparison over" in r.getMessage()]
+
+    with caplog.at_level(logging.INFO, logger=opto.logger.name):
+        for i in range(1, 2 * interval + 1):
+            jitter = rng.normal(0, 20_000, 240).astype(np.int64)
+            opto.counter.timestamps = (np.asarray(_edges(60.0, 240)) + jitter).tolist()
+            assert opto.calculate_frequency_from_pulses(240, 2.0) is not None
+
+            assert len(summaries()) == i // interval
+            assert opto._comp_log_count == i % interval
+            if i % interval == 0:
+                assert opto._comp_diff_pct_sum == 0.0
+                assert opto._comp_diff_pct_max == 0.0
+            else:
+                assert opto._comp_diff_pct_sum > 0.0
+
+    record = summaries()[0]
+    assert record.levelno == logging.INFO
+    assert f"over {interval} measurements" in record.getMessage()
+
+
+def test_cleanup_aborts_blocking_measurement(opto):
+    """cleanup() from another thread ends a long blocking measurement promptly with no result."""
+    opto.counter.timestamps = _edges(60.0, 10)
+    result = []
+    worker = threading.Thread(target=lambda: result.append(opto.count_optocoupler_pulses(10.0)))
+
+    start = time.monotonic()
+    worker.start()
+    time.sleep(0.1)
+    opto.cleanup()
+    worker.join(timeout=2.0)
+    elapsed = time.monotonic() - start
+
+    assert not worker.is_alive()
+    assert elapsed < 2.0
+    assert result == [(0, 0.0)]
+
+
+def test_start_measurement_while_active_is_rejected(opto):
+    """A second start_measurement before the window is read doesn't restart or resize it."""
+    assert opto.start_measurement(0.5)
+    window = opto.measurement_window
+    start_ns = opto.measurement_start_ns
+
+    assert opto.start_measurement(1.0) is False
+    assert opto.measurement_active
+    assert opto.measurement_window == window == 0.5
+    assert opto.measurement_start_ns == start_ns
+
+
+def test_short_window_leaves_configured_duration(opto, monkeypatch):
+    """start_measurement(0.5) times the 0.5 s window without overwriting measurement_duration."""
+    now = [START_NS]
+    monkeypatch.setattr(optocoupler, '_now_ns', lambda: now[0])
+
+    assert opto.start_measurement(0.5)
+    assert opto.measurement_duration == 2.0
+    assert opto.measurement_window == 0.5
+    opto.counter.timestamps = _edges(60.0, 60)
+
+    now[0] += 400_000_000
+    assert opto.check_measurement() == (False, None, None)
+
+    now[0] += 100_000_000
+    complete, pulse_count, elapsed = opto.check_measurement()
+    assert complete
+    assert pulse_count == 60
+    assert elapsed == pytest.approx(0.5)
+    assert opto.measurement_duration == 2.0
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for NDRingBuffer - the fixed-size sample history used by the monitor.
+"""
+
+import os
+import sys
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ring_buffer import NDRingBuffer
+
+
+def test_ring_buffer_starts_empty():
+    """A new buffer has no samples and an empty view."""
+    buf = NDRingBuffer(5)
+    assert len(buf) == 0
+    assert buf.maxlen == 5
+    assert buf.as_ndarray_view().size == 0
+
+
+def test_ring_buffer_partial_fill_is_chronological():
+    """Values come back in insertion order before the buffer wraps."""
+    buf = NDRingBuffer(5)
+    for value in (1.0, 2.0, 3.0):
+        buf.append(value)
+    assert len(buf) == 3
+    assert buf.as_ndarray_view().tolist() == [1.0, 2.0, 3.0]
+
+
+def test_ring_buffer_wraps_like_deque():
+    """Once full, the oldest samples are dropped just like deque(maxlen=N)."""
+    buf = NDRingBuffer(4)
+    for value in range(10):
+        buf.append(float(value))
+    assert len(buf) == 4
+    assert buf.as_ndarray_view().tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert list(buf) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_ring_buffer_clear():
+    """Clearing resets the length and subsequent appends start fresh."""
+    buf = NDRingBuffer(3)
+    for value in range(5):
+        buf.append(float(value))
+    buf.clear()
+    assert len(buf) == 0
+    buf.append(42.0)
+    assert buf.as_ndarray_view().tolist() == [42.0]
+
+
+def test_ring_buffer_rejects_invalid_size():
+    """A zero-length buffer is a configuration error."""
+    with pytest.raises(ValueError):
+        NDRingBuffer(0)
+
+
+def test_ring_buffer_view_dtype():
+    """The view exposes a float64 ndarray ready for NumPy math."""
+    buf = NDRingBuffer(3)
+    buf.append(1.5)
+    view = buf.as_ndarray_view()
+    assert isinstance(view, np.ndarray)
+    assert view.dtype == np.float64
+
+
+def test_ring_buffer_running_stats_match_numpy():
+    """Running mean/std track np.mean/np.std across wrap-around."""
+    rng = np.random.default_rng(0)
+    buf = NDRingBuffer(15)
+    for _ in range(100):
+        buf.append(60.0 + rng.normal(0, 0.3))
+        view = buf.as_ndarray_view()
+        assert buf.mean() == pytest.approx(np.mean(view), abs=1e-9)
+        assert buf.std() == pytest.approx(np.std(view), abs=1e-9)
+
+
+def test_ring_buffer_running_stats_reset_on_clear():
+    """Stats restart from scratch after clear()."""
+    buf = NDRingBuffer(4)
+    for value in (10.0, 20.0, 30.0):
+        buf.append(value)
+    buf.clear()
+    assert np.isnan(buf.std())
+    buf.append(5.0)
+    assert buf.mean() == 5.0
+    assert buf.std() == 0.0
+
+
+def test_ring_buffer_float32_storage():
+    """float32 storage keeps 60 Hz readings well inside measurement noise."""
+    buf = NDRingBuffer(10, dtype=np.float32)
+    values = [60.0 + 0.001 * i for i in range(10)]
+    for value in values:
+        buf.append(value)
+    view = buf.as_ndarray_view()
+    assert view.dtype == np.float32
+    assert np.allclose(view, values, atol=1e-5)
+    assert buf.std() == pytest.approx(np.std(values), abs=1e-5)
+
+
+@pytest.mark.parametrize("maxlen", [1, 3, 8, 15, 16, 17])
+def test_ring_buffer_matches_deque_for_any_size(maxlen):
+    """Power-of-two backing storage still evicts at exactly maxlen samples."""
+    buf = NDRingBuffer(maxlen)
+    reference = deque(maxlen=maxlen)
+    for value in range(3 * maxlen + 5):
+        buf.append(float(value))
+        reference.append(float(value))
+        assert buf.as_ndarray_view().tolist() == list(reference)
+        assert buf.std() == pytest.approx(np.std(list(reference)), abs=1e-9)
+
+
+def test_ring_buffer_view_is_zero_copy_after_wrap():
+    """The chronological view is a contiguous slice of the backing array, even when wrapped."""
+    buf = NDRingBuffer(5)
+    for value in range(13):
+        buf.append(float(value))
+    view = buf.as_ndarray_view()
+    assert view.tolist() == [8.0, 9.0, 10.0, 11.0, 12.0]
+    assert view.flags['C_CONTIGUOUS']
+    assert np.shares_memory(view, buf._buf)
@@ -50,8 +50,8 @@ def setup_mock_gpiod(monkeypatch=None):
         Mock gpiod module instance
     """
     if monkeypatch:
-        # Use pytest monkeypatch
-        monkeypatch.setattr('gpiod', mock_gpiod)
+        # Use pytest monkeypatch ('gpiod' alone is not a dotted path, so patch sys.modules)
+        monkeypatch.setitem(sys.modules, 'gpiod', mock_gpiod)
         monkeypatch.setattr('gpio_event_counter.gpiod', mock_gpiod)
     else:
         # Direct module patching (for non-pytest usage)
@@ -228,6 +228,19 @@ def analyze_pulse_data(counter: GPIOEventCounter, pin: int, duration: float,
     return result
 
 
+class _CounterChip:
+    """Mock chip handle that forwards to whichever chip the counter currently has open."""
+    
+    def __init__(self, counter: GPIOEventCounter):
+        self._counter = counter
+    
+    def inject_event_to_all_requests(self, event: MockEdgeEvent):
+        self._counter._chip.inject_event_to_all_requests(event)
+    
+    def __getattr__(self, name):
+        return getattr(self._counter._chip, name)
+
+
 def create_test_counter(logger: Optional[logging.Logger] = None, use_mock: bool = True,
                         monkeypatch=None) -> tuple:
     """
@@ -252,17 +265,20 @@ def create_test_counter(logger: Optional[logging.Logger] = None, use_mock: bool
     if use_mock:
         # Setup mock if not already done
         if monkeypatch:
-            mock_gpiod_module = setup_mock_gpiod(monkeypatch)
+            setup_mock_gpiod(monkeypatch)
         else:
             # Try to setup without monkeypatch (for non-pytest usage)
             try:
-                mock_gpiod_module = setup_mock_gpiod(None)
+                setup_mock_gpiod(None)
             except:
-                # If already patched, just get the module
-                from tests.mock_gpiod import mock_gpiod as mock_gpiod_module
-        mock_chip = mock_gpiod_module.Chip("/dev/gpiochip0")
+                # Already patched
+                pass
     
     counter = GPIOEventCounter(logger)
+    if use_mock:
+        # The counter opens its own chip when a pin is registered, so injected
+        # events have to go to that chip's requests rather than a separate one
+        mock_chip = _CounterChip(counter)
     return counter, mock_chip
 
 